@@ -0,0 +1 @@
+"""Офлайн-бенчмарки бота на локальному стенді API ProZorro (див. run.py)."""
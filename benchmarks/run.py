@@ -0,0 +1,327 @@
+"""
+run.py — офлайн-бенчмарки бота на локальному стенді API ProZorro.
+
+Бенчмарки:
+- sweep  — `ProZorroAPI.search_tenders` наскрізно (стрічка, дозавантаження,
+           дедуплікація, дзеркало, фільтри) проти стенду з `standin.py`;
+           стенд працює в окремому процесі, тож його робота та пам'ять
+           не потрапляють у вимірювання
+- filter — лише зіставлення тендерів з підписками (`SubscriptionMatcher`)
+- send   — черга надсилання `DeliveryQueue` з фіктивним ботом Telegram
+
+Для кожного бенчмарку звітуються тендерів/с, p50/p99 затримки та пік пам'яті.
+Результати можна зберегти у JSON (`--output`) та порівняти з попереднім
+релізом (`--baseline`).
+
+Приклади:
+    python -m benchmarks.run all --tenders 100000 --output bench.json
+    python -m benchmarks.run sweep --latency 0.05 --error-rate 0.01 --baseline bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from typing import List, Dict, Callable, Awaitable, AsyncIterator
+
+import aiohttp
+
+from benchmarks.standin import API_PREFIX, REGIONS, CPV_CODES, synthetic_tender, add_standin_arguments, standin_argv
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STANDIN_START_TIMEOUT = 15  # секунди
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль методом найближчого рангу (values не мають бути порожніми)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(tenders: int, elapsed: float, latencies: List[float], **extra) -> Dict:
+    """Формує результат бенчмарку (пік пам'яті додає `measure`)."""
+    result = {
+        "tenders": tenders,
+        "seconds": round(elapsed, 3),
+        "tenders_per_sec": round(tenders / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+    }
+    result.update(extra)
+    return result
+
+
+async def measure(benchmark: Callable[[argparse.Namespace], Awaitable[Dict]], args: argparse.Namespace) -> Dict:
+    """Запускає бенчмарк, відстежуючи пік виділеної пам'яті через tracemalloc."""
+    tracemalloc.start()
+    try:
+        result = await benchmark(args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    result["peak_mem_mb"] = round(peak / 2 ** 20, 2)
+    return result
+
+
+@contextlib.asynccontextmanager
+async def standin_process(args: argparse.Namespace) -> AsyncIterator[str]:
+    """
+    Запускає стенд в окремому процесі та чекає, доки він прийматиме з'єднання.
+
+    Yields:
+        str: адреса службового ендпоінта `/__stats` стенду
+    """
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.standin", *standin_argv(args), cwd=PROJECT_DIR,
+    )
+    try:
+        deadline = time.monotonic() + STANDIN_START_TIMEOUT
+        while True:
+            if process.returncode is not None:
+                raise RuntimeError(f"Стенд завершився з кодом {process.returncode}")
+            try:
+                _, writer = await asyncio.open_connection(args.host, args.port)
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Стенд не запустився за {STANDIN_START_TIMEOUT} с")
+                await asyncio.sleep(0.1)
+                continue
+            writer.close()
+            await writer.wait_closed()
+            break
+
+        yield f"http://{args.host}:{args.port}/__stats"
+    finally:
+        if process.returncode is None:
+            process.terminate()
+        await process.wait()
+
+
+async def standin_stats(url: str) -> Dict:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            return await response.json()
+
+
+async def bench_sweep(args: argparse.Namespace) -> Dict:
+    """Обходи стрічки від початку до кінця; затримка рахується на кожен обхід."""
+    from tender_api import ProZorroAPI
+    from enrichment import TenderEnricher
+    from metrics import STAGE_SECONDS
+
+    async with standin_process(args) as stats_url:
+        # Стенд живе в іншому процесі: tracemalloc і таймери бачать лише клієнт
+        tracemalloc.reset_peak()
+        api = ProZorroAPI(
+            cold_start="catchup",
+            request_delay=args.request_delay,
+            enricher=TenderEnricher(rate_limit=args.enrich_rate),
+        )
+        latencies, matches, errors, sweeps = [], 0, 0, 0
+
+        try:
+            started = time.perf_counter()
+            while True:
+                sweep_started = time.perf_counter()
+                async for page in api.search_tenders():
+                    matches += len(page)
+                latencies.append(time.perf_counter() - sweep_started)
+                sweeps += 1
+
+                if api.last_sweep.error is not None:
+                    errors += 1
+                elif api.last_sweep.complete and not api.cursor.retry:
+                    break
+            elapsed = time.perf_counter() - started
+        finally:
+            await api.close()
+
+        standin = await standin_stats(stats_url)
+
+    # Середня тривалість кожного етапу з вбудованих метрик бота
+    stages = {
+        f"{stage}_avg_ms": round(STAGE_SECONDS.sum(stage=stage) / STAGE_SECONDS.count(stage=stage) * 1000, 3)
+        for (stage,) in STAGE_SECONDS.label_values()
+    }
+    return summarize(
+        standin["size"], elapsed, latencies,
+        sweeps=sweeps, sweep_errors=errors, matches=matches, requests=standin["requests"], **stages,
+    )
+
+
+async def bench_filter(args: argparse.Namespace) -> Dict:
+    """Зіставлення сторінок по 100 тендерів з `--subscriptions` підписками."""
+    from matcher import Subscription, SubscriptionMatcher, default_subscription
+    from records import TenderRecord
+
+    rng = random.Random(0)
+    subscriptions = [default_subscription()] + [
+        Subscription(
+            id=str(i),
+            cpv_codes=[code.split("-")[0] for code in rng.sample(CPV_CODES, rng.randint(1, 4))],
+            regions=rng.sample(REGIONS, rng.randint(1, 3)),
+        )
+        for i in range(args.subscriptions)
+    ]
+
+    records = [TenderRecord.from_api(synthetic_tender(i)) for i in range(args.filter_tenders)]
+    pages = [records[i:i + 100] for i in range(0, len(records), 100)]
+
+    compile_started = time.perf_counter()
+    matcher = SubscriptionMatcher(subscriptions)
+    compile_seconds = time.perf_counter() - compile_started
+
+    latencies, matched = [], 0
+    started = time.perf_counter()
+    for page in pages:
+        page_started = time.perf_counter()
+        matched += len(matcher.match_many(page))
+        latencies.append(time.perf_counter() - page_started)
+    elapsed = time.perf_counter() - started
+
+    return summarize(
+        len(records), elapsed, latencies,
+        subscriptions=len(subscriptions), matched=matched, compile_ms=round(compile_seconds * 1000, 3),
+    )
+
+
+class FakeBot:
+    """Фіктивний бот Telegram: імітує затримку та, за потреби, RetryAfter."""
+
+    def __init__(self, latency: float, retry_rate: float):
+        self.latency = latency
+        self.retry_rate = retry_rate
+        self.sent: List[float] = []
+
+    async def send_message(self, chat_id: int, text: str, parse_mode: str = None) -> None:
+        from telegram.error import RetryAfter
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if random.random() < self.retry_rate:
+            raise RetryAfter(1)
+        self.sent.append(time.perf_counter())
+
+
+async def bench_send(args: argparse.Namespace) -> Dict:
+    """Надсилання `--send-tenders` тендерів у `--chats` чатів через DeliveryQueue."""
+    from delivery import DeliveryQueue
+    from records import TenderRecord
+    from subscriptions import SubscriptionStore
+    from tender_api import TenderMatch
+
+    store = SubscriptionStore(os.path.join(args.data_dir, "bench_send.db"))
+    for chat_id in range(1, args.chats + 1):
+        store.subscribe(chat_id)
+
+    bot = FakeBot(args.send_latency, args.retry_rate)
+    queue = DeliveryQueue(bot, store, digest=args.digest, chat_rate=args.chat_rate, global_rate=args.global_rate)
+
+    rng = random.Random(0)
+    matches = [
+        TenderMatch(
+            record=TenderRecord.from_api(synthetic_tender(i)),
+            subscriptions={str(rng.randint(1, args.chats))},
+        )
+        for i in range(args.send_tenders)
+    ]
+
+    started = time.perf_counter()
+    for i in range(0, len(matches), 100):
+        queue.enqueue(matches[i:i + 100])
+    while store.outbox_size():
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    await queue.stop()
+    store.close()
+
+    latencies = [sent - started for sent in bot.sent]
+    return summarize(
+        args.send_tenders, elapsed, latencies,
+        messages=len(bot.sent), messages_per_sec=round(len(bot.sent) / elapsed, 1), chats=args.chats,
+    )
+
+
+BENCHMARKS = {
+    "sweep": bench_sweep,
+    "filter": bench_filter,
+    "send": bench_send,
+}
+
+
+def print_results(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> None:
+    """Друкує результати та зміну відносно базових (якщо вони є)."""
+    for name, result in results.items():
+        print(f"\n== {name} ==")
+        previous = baseline.get(name, {})
+        for key, value in result.items():
+            line = f"  {key:>18}: {value}"
+            old = previous.get(key)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                line += f"  ({(value - old) / old * 100:+.1f}% від базового {old})"
+            print(line)
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Офлайн-бенчмарки бота тендерів ProZorro")
+    parser.add_argument("benchmark", choices=[*BENCHMARKS, "all"], nargs="?", default="all")
+    add_standin_arguments(parser)
+    parser.add_argument("--request-delay", type=float, default=0.0, help="пауза між сторінками стрічки, с")
+    parser.add_argument("--enrich-rate", type=float, default=1000.0, help="ліміт запитів карток на секунду")
+    parser.add_argument("--subscriptions", type=int, default=500, help="кількість підписок для filter")
+    parser.add_argument("--filter-tenders", type=int, default=100_000, help="кількість тендерів для filter")
+    parser.add_argument("--send-tenders", type=int, default=2_000, help="кількість тендерів для send")
+    parser.add_argument("--chats", type=int, default=50, help="кількість чатів для send")
+    parser.add_argument("--send-latency", type=float, default=0.005, help="затримка фіктивного Telegram, с")
+    parser.add_argument("--retry-rate", type=float, default=0.0, help="частка відповідей RetryAfter")
+    parser.add_argument("--chat-rate", type=float, default=1000.0, help="ліміт повідомлень на чат за секунду")
+    parser.add_argument("--global-rate", type=float, default=1000.0, help="глобальний ліміт повідомлень за секунду")
+    parser.add_argument("--digest", action="store_true", help="режим дайджесту для send")
+    parser.add_argument("--output", help="зберегти результати у JSON")
+    parser.add_argument("--baseline", help="JSON з результатами попереднього релізу для порівняння")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict]:
+    names = list(BENCHMARKS) if args.benchmark == "all" else [args.benchmark]
+    results = {}
+    for name in names:
+        results[name] = await measure(BENCHMARKS[name], args)
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    with tempfile.TemporaryDirectory(prefix="tender-bench-") as data_dir:
+        args.data_dir = data_dir
+        # Модулі бота читають налаштування під час імпорту, тому оточення задається заздалегідь
+        os.environ.setdefault("TELEGRAM_TOKEN", "benchmark")
+        os.environ["DATA_DIR"] = data_dir
+        os.environ["COLD_START_MODE"] = "catchup"
+        os.environ["PROZORRO_BASE_URL"] = f"http://{args.host}:{args.port}{API_PREFIX}"
+
+        results = asyncio.run(run(args))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+standin.py — локальний стенд, що імітує API ProZorro для бенчмарків.
+
+Стенд віддає стрічку `/tenders` та картки `/tenders/{id}` з синтетичних
+або записаних тендерів:
+- синтетичні тендери генеруються детерміновано за номером, тож стрічка на
+  100 000 тендерів не займає пам'яті
+- записані тендери читаються з JSON Lines файлу (один повний тендер на рядок)
+
+Затримка відповіді та частка помилок (503 і 429 з Retry-After) налаштовуються.
+Службовий `GET /__stats` повертає розмір стрічки та кількість оброблених запитів.
+
+Запуск окремо:
+    python -m benchmarks.standin --tenders 100000 --port 8765
+"""
+
+import json
+import random
+import asyncio
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional
+
+from aiohttp import web
+
+API_PREFIX = "/api/2.5/tenders"
+
+REGIONS = [
+    "Київська область", "м. Київ", "Черкаська область", "Львівська область",
+    "Одеська область", "Харківська область", "Дніпропетровська область", "Вінницька область",
+]
+CPV_CODES = [
+    "15420000-8", "15331000-7", "15610000-7", "15981000-8", "03111000-2",
+    "09130000-9", "33600000-6", "44110000-4", "45260000-7", "79710000-4",
+]
+WORDS = ["Закупівля", "ремонт", "молоко", "борошно", "дах", "школа", "пальне", "ліки", "послуги", "обладнання"]
+
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def synthetic_tender(index: int) -> Dict:
+    """
+    Генерує повний тендер за його номером у стрічці.
+
+    Args:
+        index (int): номер тендера
+
+    Returns:
+        dict: тендер у форматі API ProZorro
+    """
+    rng = random.Random(index)
+    moment = EPOCH + timedelta(seconds=index)
+    return {
+        "id": f"{index:032x}",
+        "tenderID": f"UA-2026-01-01-{index:06d}-a",
+        "title": " ".join(rng.sample(WORDS, 3)),
+        "status": "active.tendering",
+        "dateCreated": moment.isoformat(),
+        "dateModified": moment.isoformat(),
+        "procuringEntity": {
+            "name": f"Замовник {index % 997}",
+            "address": {"region": rng.choice(REGIONS)},
+        },
+        "classification": {"id": rng.choice(CPV_CODES), "scheme": "ДК021"},
+        "value": {"amount": round(rng.uniform(1_000, 5_000_000), 2), "currency": "UAH"},
+    }
+
+
+@dataclass
+class StandInConfig:
+    """
+    Параметри стенду.
+
+    Attributes:
+        tenders (int): кількість синтетичних тендерів (якщо немає записаних)
+        latency (float): середня затримка відповіді (секунди)
+        error_rate (float): частка відповідей 503
+        throttle_rate (float): частка відповідей 429 з Retry-After
+        full_listing (bool): чи повертати у стрічці поля з opt_fields (інакше лише id та dateModified)
+    """
+    tenders: int = 10_000
+    latency: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    full_listing: bool = True
+
+
+class StandIn:
+    """
+    HTTP-стенд API ProZorro на aiohttp.
+
+    Attributes:
+        config (StandInConfig): параметри стенду
+        requests (int): кількість оброблених запитів
+    """
+
+    def __init__(self, config: StandInConfig, recorded: Optional[List[Dict]] = None):
+        self.config = config
+        self.requests = 0
+        self._recorded = recorded
+        self._index = {tender["id"]: i for i, tender in enumerate(recorded)} if recorded else None
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def size(self) -> int:
+        """int: кількість тендерів у стрічці."""
+        return len(self._recorded) if self._recorded is not None else self.config.tenders
+
+    def _tender(self, index: int) -> Dict:
+        return self._recorded[index] if self._recorded is not None else synthetic_tender(index)
+
+    def _listing_item(self, index: int, opt_fields: List[str]) -> Dict:
+        tender = self._tender(index)
+        item = {"id": tender["id"], "dateModified": tender["dateModified"]}
+        if self.config.full_listing:
+            item.update({field: tender[field] for field in opt_fields if field in tender})
+        return item
+
+    async def _simulate(self) -> Optional[web.Response]:
+        """Додає затримку та, з заданою ймовірністю, повертає відповідь з помилкою."""
+        self.requests += 1
+        if self.config.latency:
+            await asyncio.sleep(random.expovariate(1 / self.config.latency))
+        roll = random.random()
+        if roll < self.config.throttle_rate:
+            return web.json_response({"status": "error"}, status=429, headers={"Retry-After": "1"})
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            return web.json_response({"status": "error"}, status=503)
+        return None
+
+    async def listing(self, request: web.Request) -> web.Response:
+        """GET /tenders — сторінка стрічки змін; курсор — номер наступного тендера."""
+        error = await self._simulate()
+        if error is not None:
+            return error
+
+        limit = int(request.query.get("limit", 100))
+        opt_fields = [field for field in request.query.get("opt_fields", "").split(",") if field]
+
+        if request.query.get("descending"):
+            last = self.size - 1
+            data = [self._listing_item(last, opt_fields)] if last >= 0 else []
+            return web.json_response({"data": data, "prev_page": {"offset": str(self.size)}})
+
+        offset = request.query.get("offset") or "0"
+        start = min(int(float(offset)), self.size)
+        end = min(start + limit, self.size)
+        data = [self._listing_item(i, opt_fields) for i in range(start, end)]
+        return web.json_response({"data": data, "next_page": {"offset": str(end)}})
+
+    async def details(self, request: web.Request) -> web.Response:
+        """GET /tenders/{id} — повна картка тендера."""
+        error = await self._simulate()
+        if error is not None:
+            return error
+
+        tender_id = request.match_info["tender_id"]
+        if self._index is not None:
+            index = self._index.get(tender_id)
+        else:
+            index = int(tender_id, 16) if len(tender_id) == 32 else None
+        if index is None or index >= self.size:
+            raise web.HTTPNotFound()
+        return web.json_response({"data": self._tender(index)})
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """GET /__stats — розмір стрічки та кількість запитів (не рахується у `requests`)."""
+        return web.json_response({"size": self.size, "requests": self.requests})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/__stats", self.stats)
+        app.router.add_get(API_PREFIX, self.listing)
+        app.router.add_get(API_PREFIX + "/{tender_id}", self.details)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> str:
+        """
+        Запускає стенд у поточному event loop.
+
+        Returns:
+            str: базова адреса стрічки для PROZORRO_BASE_URL
+        """
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def load_recorded(path: str) -> List[Dict]:
+    """
+    Завантажує записані тендери з JSON Lines файлу, впорядковані за dateModified.
+
+    Args:
+        path (str): шлях до файлу (кожен рядок — тендер або відповідь `{"data": тендер}`)
+
+    Returns:
+        list: повні тендери
+    """
+    tenders = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                tender = json.loads(line)
+                tenders.append(tender.get("data", tender))
+    tenders.sort(key=lambda tender: tender.get("dateModified", ""))
+    return tenders
+
+
+def add_standin_arguments(parser: argparse.ArgumentParser) -> None:
+    """Додає до парсера аргументи налаштування стенду."""
+    parser.add_argument("--tenders", type=int, default=10_000, help="кількість синтетичних тендерів")
+    parser.add_argument("--recorded", help="JSON Lines файл із записаними тендерами")
+    parser.add_argument("--latency", type=float, default=0.0, help="середня затримка відповіді, с")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="частка відповідей 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="частка відповідей 429")
+    parser.add_argument("--minimal-listing", action="store_true",
+                        help="повертати у стрічці лише id та dateModified (змушує дозавантажувати картки)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+
+
+def standin_argv(args: argparse.Namespace) -> List[str]:
+    """Відтворює аргументи стенду для запуску `python -m benchmarks.standin` в окремому процесі."""
+    argv = [
+        "--tenders", str(args.tenders),
+        "--latency", str(args.latency),
+        "--error-rate", str(args.error_rate),
+        "--throttle-rate", str(args.throttle_rate),
+        "--host", args.host,
+        "--port", str(args.port),
+    ]
+    if args.recorded:
+        argv += ["--recorded", args.recorded]
+    if args.minimal_listing:
+        argv.append("--minimal-listing")
+    return argv
+
+
+def standin_from_args(args: argparse.Namespace) -> StandIn:
+    """Створює стенд за аргументами командного рядка."""
+    config = StandInConfig(
+        tenders=args.tenders,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        full_listing=not args.minimal_listing,
+    )
+    recorded = load_recorded(args.recorded) if args.recorded else None
+    return StandIn(config, recorded)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальний стенд API ProZorro")
+    add_standin_arguments(parser)
+    args = parser.parse_args()
+
+    standin = standin_from_args(args)
+    print(f"Стенд: http://{args.host}:{args.port}{API_PREFIX} ({standin.size} тендерів)", flush=True)
+    web.run_app(standin.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
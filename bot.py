@@ -1,12 +1,30 @@
+import os
+import time
+import asyncio
 import logging
+from collections import Counter
+from typing import Dict, List, Optional
+
 from telegram import Update
 from telegram.ext import (
     Application,
     CommandHandler,
     ContextTypes,
 )
-from tender_api import ProZorroAPI
-from config import TELEGRAM_TOKEN, CHAT_ID, CHECK_INTERVAL
+from tender_api import ProZorroAPI, SweepStats
+from mirror import MirrorQuery
+from subscriptions import SubscriptionStore
+from delivery import DeliveryQueue
+from scheduler import AdaptiveScheduler
+from profiler import SamplingProfiler
+from metrics import (
+    MetricsServer, STAGE_SECONDS, SWEEP_SECONDS, SWEEPS, PAGES, TENDERS, MESSAGES,
+    SEEN_SIZE, OUTBOX_DEPTH, MIRROR_SIZE, SUBSCRIPTIONS
+)
+from config import (
+    TELEGRAM_TOKEN, CHAT_ID, MIRROR_PAGE_SIZE, ADMIN_CHAT_IDS, METRICS_PORT,
+    PROFILE_SWEEP, PROFILE_INTERVAL, PROFILE_DIR
+)
 
 # Налаштування логування
 logging.basicConfig(
@@ -15,11 +33,178 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+subscriptions = SubscriptionStore()
+
+# Чат з .env підписується один раз у новій базі, щоб наявні розгортання працювали
+# як раніше; після /unsubscribe перезапуск його не повертає
+if CHAT_ID:
+    subscriptions.bootstrap(CHAT_ID)
+
 api = ProZorroAPI()
+api.set_subscriptions(subscriptions.all())
+
+scheduler = AdaptiveScheduler()
+
+# Розміри сховищ обчислюються лише під час збору метрик
+SEEN_SIZE.set_function(lambda: len(api.seen))
+MIRROR_SIZE.set_function(lambda: len(api.mirror))
+OUTBOX_DEPTH.set_function(subscriptions.outbox_size)
+SUBSCRIPTIONS.set_function(lambda: len(subscriptions.all()))
+
+metrics_server: Optional[MetricsServer] = None
+
+# Чи профілювати наступний обхід (PROFILE_SWEEP або команда /profile)
+_profile_next_sweep = PROFILE_SWEEP
+
+# Черга надсилання створюється після ініціалізації бота (див. post_init)
+queue: Optional[DeliveryQueue] = None
+
+# Поточний обхід стрічки (новий не стартує, доки попередній не завершився)
+_sweep_task: Optional[asyncio.Task] = None
+
+
+def refresh_subscriptions() -> None:
+    """Перекомпілює фільтри після зміни підписок."""
+    api.set_subscriptions(subscriptions.all())
+
+
+def parse_list(args: List[str], separators: str = ",") -> List[str]:
+    """Розбиває аргументи команди на список значень за комами."""
+    text = " ".join(args)
+    for separator in separators[1:]:
+        text = text.replace(separator, separators[0])
+    return [item.strip() for item in text.split(separators[0]) if item.strip()]
+
+
+def describe_subscription(chat_id: int) -> str:
+    """Повертає опис фільтрів підписки чату."""
+    subscription = subscriptions.get(chat_id)
+    if subscription is None:
+        return "Чат не підписаний. Скористайтеся командою /subscribe."
+    return (
+        "🎯 Ваші фільтри:\n"
+        f"CPV: {', '.join(subscription.cpv_codes) or 'усі'}\n"
+        f"Регіони: {', '.join(subscription.regions) or 'усі'}"
+    )
+
+
+def parse_tenders_query(args: List[str], chat_id: int) -> MirrorQuery:
+    """
+    Розбирає аргументи /tenders у запит до дзеркала.
+
+    Формат: `/tenders [слова] [min=СУМА] [region=РЕГІОН] [cpv=КОД] [days=N] [page=N]`.
+    Якщо регіон і CPV не вказані, застосовуються фільтри підписки чату.
+
+    Raises:
+        ValueError: якщо числовий параметр має неправильний формат або менший за 1
+    """
+    query = MirrorQuery(page_size=MIRROR_PAGE_SIZE)
+
+    for arg in args:
+        key, _, value = arg.partition("=")
+        key = key.lower()
+        if not value:
+            query.keywords.append(arg)
+        elif key == "min":
+            query.min_amount = float(value.replace(",", "."))
+        elif key == "region":
+            query.regions.append(value.replace("_", " "))
+        elif key == "cpv":
+            query.cpv_codes.extend(parse_list([value]))
+        elif key == "days":
+            query.days = int(value)
+            if query.days < 1:
+                raise ValueError(f"Кількість днів має бути додатною: {value}")
+        elif key == "page":
+            query.page = int(value)
+            if query.page < 1:
+                raise ValueError(f"Номер сторінки має бути додатним: {value}")
+        else:
+            query.keywords.append(arg)
+
+    subscription = subscriptions.get(chat_id)
+    if subscription and not query.regions and not query.cpv_codes:
+        query.regions = list(subscription.regions)
+        query.cpv_codes = list(subscription.cpv_codes)
+    return query
+
+
+async def sweep() -> Dict[int, int]:
+    """
+    Один обхід стрічки: збіги кожної сторінки одразу потрапляють у чергу надсилання.
+
+    Returns:
+        Dict[int, int]: кількість тендерів, поставлених у чергу кожного чату
+    """
+    global _profile_next_sweep
+    profiler = None
+    if _profile_next_sweep:
+        _profile_next_sweep = False
+        profiler = SamplingProfiler(PROFILE_INTERVAL)
+        profiler.start()
+
+    enqueued: Counter = Counter()
+    try:
+        async for matches in api.search_tenders():
+            enqueued.update(queue.enqueue(matches))
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            try:
+                profiler.write(os.path.join(PROFILE_DIR, time.strftime("sweep-%Y%m%d-%H%M%S.folded")))
+            except OSError as e:
+                logger.error(f"Не вдалося зберегти профіль обходу: {e}")
+
+    logger.info(f"У черзі на надсилання {sum(enqueued.values())} тендерів для {len(enqueued)} чатів")
+    return enqueued
+
+
+async def run_sweep() -> Dict[int, int]:
+    """Запускає обхід або приєднується до вже запущеного."""
+    global _sweep_task
+    if _sweep_task is None or _sweep_task.done():
+        _sweep_task = asyncio.create_task(sweep())
+    return await asyncio.shield(_sweep_task)
+
+
+def is_admin(update: Update) -> bool:
+    """Чи має чат доступ до службових команд (/stats, /profile)."""
+    return update.effective_chat.id in ADMIN_CHAT_IDS
+
+
+def format_stats() -> str:
+    """Готує текст відповіді /stats з поточних метрик."""
+    average_sweep = SWEEP_SECONDS.sum() / SWEEP_SECONDS.count() if SWEEP_SECONDS.count() else 0.0
+    lines = [
+        "📊 Статистика з моменту запуску",
+        f"Обходи: {SWEEP_SECONDS.count()} (повних {SWEEPS.get(result='complete'):.0f}, "
+        f"неповних {SWEEPS.get(result='partial'):.0f}, з помилкою {SWEEPS.get(result='error'):.0f}), "
+        f"у середньому {average_sweep:.2f} с",
+        f"Сторінки: {PAGES.get(result='ok'):.0f}, без змін {PAGES.get(result='not_modified'):.0f}, "
+        f"429: {PAGES.get(result='throttled'):.0f}, помилки {PAGES.get(result='error'):.0f}",
+        f"Тендери: отримано {TENDERS.get(stage='fetched'):.0f}, нових {TENDERS.get(stage='new'):.0f}, "
+        f"збігів {TENDERS.get(stage='matched'):.0f}",
+        f"Повідомлення: надіслано {MESSAGES.get(result='sent'):.0f}, RetryAfter {MESSAGES.get(result='retry_after'):.0f}, "
+        f"відхилено {MESSAGES.get(result='rejected'):.0f}, помилки {MESSAGES.get(result='error'):.0f}",
+        f"Оброблених тендерів: {SEEN_SIZE.get():.0f}, у дзеркалі: {MIRROR_SIZE.get():.0f}, "
+        f"у черзі: {OUTBOX_DEPTH.get():.0f}, підписок: {SUBSCRIPTIONS.get():.0f}",
+        f"Стрічку оброблено до: {api.cursor.date_modified or 'невідомо'} (UTC)",
+        "",
+        "⏱ Етапи, мс (p50 / p99, кількість):",
+    ]
+    for (stage,) in STAGE_SECONDS.label_values():
+        p50 = STAGE_SECONDS.quantile(0.5, stage=stage) * 1000
+        p99 = STAGE_SECONDS.quantile(0.99, stage=stage) * 1000
+        lines.append(f"{stage}: {p50:.1f} / {p99:.1f} ({STAGE_SECONDS.count(stage=stage)})")
+    return "\n".join(lines)
+
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обробник команди /start."""
-    await update.message.reply_text("👋 Привіт! Це бот моніторингу тендерів ProZorro.")
+    await update.message.reply_text(
+        "👋 Привіт! Це бот моніторингу тендерів ProZorro.\n"
+        "Щоб отримувати сповіщення, надішліть /subscribe."
+    )
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обробник команди /help."""
@@ -27,58 +212,162 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "📖 Доступні команди:\n"
         "/start - початок роботи\n"
         "/help - довідка\n"
-        "/tenders - отримати список нових тендерів"
+        "/subscribe - підписатися на сповіщення\n"
+        "/unsubscribe - відписатися\n"
+        "/filters - показати фільтри підписки\n"
+        "/cpv 15420000, 15330000 - задати CPV-коди (без аргументів — усі)\n"
+        "/regions Київ, Черкаська - задати регіони (без аргументів — усі)\n"
+        "/tenders [слова] [min=СУМА] [region=РЕГІОН] [cpv=КОД] [days=N] [page=N] - "
+        "пошук у зібраних тендерах (без регіону та CPV — за фільтрами підписки)"
     )
     await update.message.reply_text(help_text)
 
+async def subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник команди /subscribe."""
+    subscriptions.subscribe(update.effective_chat.id)
+    refresh_subscriptions()
+    await update.message.reply_text("✅ Підписку оформлено.\n" + describe_subscription(update.effective_chat.id))
+
+async def unsubscribe(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник команди /unsubscribe."""
+    if subscriptions.unsubscribe(update.effective_chat.id):
+        refresh_subscriptions()
+        await update.message.reply_text("🔕 Підписку скасовано.")
+    else:
+        await update.message.reply_text("Чат не був підписаний.")
+
+async def filters_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник команди /filters."""
+    await update.message.reply_text(describe_subscription(update.effective_chat.id))
+
+async def cpv(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник команди /cpv — змінює CPV-коди підписки."""
+    chat_id = update.effective_chat.id
+    if subscriptions.update(chat_id, cpv_codes=parse_list(context.args, ", ")) is not None:
+        refresh_subscriptions()
+    await update.message.reply_text(describe_subscription(chat_id))
+
+async def regions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник команди /regions — змінює регіони підписки."""
+    chat_id = update.effective_chat.id
+    if subscriptions.update(chat_id, regions=parse_list(context.args)) is not None:
+        refresh_subscriptions()
+    await update.message.reply_text(describe_subscription(chat_id))
+
 async def tenders(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Обробник команди /tenders."""
+    """Обробник команди /tenders — пошук у локальному дзеркалі тендерів."""
+    try:
+        query = parse_tenders_query(context.args, update.effective_chat.id)
+    except ValueError:
+        await update.message.reply_text(
+            "⚠️ Неправильний формат. Приклад: /tenders ремонт min=100000 region=Київ days=7 page=2"
+        )
+        return
+
     try:
-        results = api.search_tenders()
+        records, total = api.mirror.search(query)
 
-        if not results:
-            await update.message.reply_text("Немає нових тендерів.")
+        if not records:
+            await update.message.reply_text("Тендерів за запитом не знайдено.")
             return
 
-        for tender in results[:5]:  # обмежимо вивід для зручності
-            await update.message.reply_text(
-                tender,
-                parse_mode="Markdown"
-            )
+        pages = (total + query.page_size - 1) // query.page_size
+        text = "\n\n".join(record.render() for record in records)
+        await update.message.reply_text(
+            f"{text}\n\nСторінка {query.page} з {pages} (усього {total})",
+            parse_mode="Markdown"
+        )
 
     except Exception as e:
         logger.error(f"Помилка у команді /tenders: {e}")
-        await update.message.reply_text("⚠️ Сталася помилка при отриманні тендерів.")
+        await update.message.reply_text("⚠️ Сталася помилка при пошуку тендерів.")
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник команди /stats — метрики обходів і надсилання (лише для адміністраторів)."""
+    if not is_admin(update):
+        await update.message.reply_text("⛔ Команда доступна лише адміністраторам.")
+        return
+    await update.message.reply_text(format_stats())
+
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Обробник команди /profile — профілювання наступного обходу (лише для адміністраторів)."""
+    global _profile_next_sweep
+    if not is_admin(update):
+        await update.message.reply_text("⛔ Команда доступна лише адміністраторам.")
+        return
+    _profile_next_sweep = True
+    await update.message.reply_text(f"🔬 Наступний обхід буде профільовано, профіль збережеться у {PROFILE_DIR}.")
 
 async def auto_check(context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Функція для автоматичної перевірки нових тендерів."""
-    try:
-        results = api.search_tenders()
+    """
+    Функція для автоматичної перевірки нових тендерів.
 
-        for tender in results:
-            await context.bot.send_message(
-                chat_id=CHAT_ID,
-                text=tender,
-                parse_mode="Markdown"
-            )
+    Після кожного обходу планує наступний з паузою від AdaptiveScheduler,
+    тому обходи ніколи не перекриваються.
+    """
+    try:
+        await run_sweep()
+        stats = api.last_sweep
 
     except Exception as e:
         logger.error(f"Помилка авто-перевірки: {e}")
+        stats = SweepStats(error=e)
+
+    context.job_queue.run_once(auto_check, when=scheduler.next_delay(stats))
+
+async def post_init(application: Application) -> None:
+    """Створює чергу надсилання, відновлює ненадіслане після перезапуску та запускає ендпоінт метрик."""
+    global queue, metrics_server
+    queue = DeliveryQueue(application.bot, subscriptions, on_blocked=lambda chat_id: refresh_subscriptions())
+    queue.start()
+
+    if METRICS_PORT:
+        metrics_server = MetricsServer()
+        try:
+            await metrics_server.start()
+        except OSError as e:
+            # Зайнятий порт не повинен заважати роботі бота
+            logger.error(f"Не вдалося запустити ендпоінт метрик: {e}")
+            metrics_server = None
+
+async def shutdown(application: Application) -> None:
+    """Зупиняє чергу надсилання та ендпоінт метрик, закриває HTTP-сесію ProZorro та сховища."""
+    if queue is not None:
+        await queue.stop()
+    if metrics_server is not None:
+        await metrics_server.stop()
+    await api.close()
+    subscriptions.close()
 
 def main() -> None:
     """Головна функція запуску Telegram-бота."""
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    # concurrent_updates дозволяє обробляти /tenders паралельно з авто-перевіркою
+    application = (
+        Application.builder()
+        .token(TELEGRAM_TOKEN)
+        .concurrent_updates(True)
+        .post_init(post_init)
+        .post_shutdown(shutdown)
+        .build()
+    )
 
     # Реєстрація команд
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
+    application.add_handler(CommandHandler("subscribe", subscribe))
+    application.add_handler(CommandHandler("unsubscribe", unsubscribe))
+    application.add_handler(CommandHandler("filters", filters_command))
+    application.add_handler(CommandHandler("cpv", cpv))
+    application.add_handler(CommandHandler("regions", regions))
     application.add_handler(CommandHandler("tenders", tenders))
+    application.add_handler(CommandHandler("stats", stats_command))
+    application.add_handler(CommandHandler("profile", profile_command))
 
-    # Запуск автоматичної перевірки кожні N секунд
-    application.job_queue.run_repeating(auto_check, interval=CHECK_INTERVAL, first=10)
+    # Перша автоматична перевірка; далі кожна наступна планується адаптивно
+    application.job_queue.run_once(auto_check, when=10)
 
     logger.info("🚀 Бот запущено!")
     application.run_polling()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -42,10 +42,15 @@ def get_env_variable(name: str, cast_type=str, required: bool = True):
 
 # --- Telegram Bot ---
 TELEGRAM_TOKEN = get_env_variable("TELEGRAM_TOKEN", str, required=True)
-CHAT_ID = get_env_variable("CHAT_ID", int, required=True)
+# Необов'язковий чат, який автоматично підписується при першому запуску
+CHAT_ID = get_env_variable("CHAT_ID", int, required=False)
 
 # --- ProZorro API ---
-BASE_URL = "https://public.api.openprocurement.org/api/2.5/tenders"
+# Можна перевизначити, наприклад, для локального стенду бенчмарків
+BASE_URL = (
+    get_env_variable("PROZORRO_BASE_URL", str, required=False)
+    or "https://public.api.openprocurement.org/api/2.5/tenders"
+)
 
 # CPV коди для пошуку (харчування та товари)
 CPV_CODES = [
@@ -69,7 +74,86 @@ SESSION_HEADERS = {
 PAGE_LIMIT = 100   # кількість тендерів на сторінку
 MAX_PAGES = 15     # максимум сторінок для обходу
 
+STREAM_CHUNK_SIZE = 16 * 1024  # байти (розмір частини тіла відповіді для потокового розбору)
+
+# Додаткові поля у стрічці (API ігнорує ті, що не дозволені для списку)
+LISTING_OPT_FIELDS = ["tenderID", "title", "procuringEntity", "classification", "value", "dateCreated"]
+
+# --- Дозавантаження повних даних тендерів ---
+ENRICH_CONCURRENCY = 16   # максимум одночасних запитів деталей
+ENRICH_RATE_LIMIT = 50    # запитів на секунду до одного хоста
+ENRICH_RETRIES = 3        # повторні спроби після помилки
+ENRICH_BACKOFF = 0.5      # секунди (базова затримка експоненційного відступу)
+ENRICH_RETRY_SWEEPS = 10  # скільки обходів повторювати тендер, який не вдалося дозавантажити
+
+# --- Стан між перезапусками ---
+DATA_DIR = get_env_variable("DATA_DIR", str, required=False) or "data"
+CURSOR_FILE = os.path.join(DATA_DIR, "feed_cursor.json")
+
+# Поведінка при першому запуску без збереженого курсора:
+# "catchup" — обійти стрічку з початку, "latest" — почати з поточного моменту
+COLD_START_MODE = (get_env_variable("COLD_START_MODE", str, required=False) or "latest").strip().lower()
+
+# Сховище оброблених тендерів: "sqlite" (на диску) або "memory"
+SEEN_BACKEND = get_env_variable("SEEN_BACKEND", str, required=False) or "sqlite"
+SEEN_DB_FILE = os.path.join(DATA_DIR, "seen.db")
+SEEN_MAX_SIZE = 200_000        # максимум записів для бекенда "memory"
+SEEN_TTL = 90 * 24 * 3600      # секунди (90 днів) — час життя запису
+
+# Підписки чатів та журнал доставки
+SUBSCRIPTIONS_DB_FILE = os.path.join(DATA_DIR, "subscriptions.db")
+
+# Локальне дзеркало тендерів для пошуку через /tenders
+MIRROR_DB_FILE = os.path.join(DATA_DIR, "mirror.db")
+MIRROR_TTL = 180 * 24 * 3600   # секунди (180 днів) — записи без оновлень видаляються
+MIRROR_PAGE_SIZE = 5           # тендерів на сторінці відповіді /tenders
+
+# --- Надсилання у Telegram ---
+# Ліміти Telegram: близько 1 повідомлення на секунду в особистий чат і 20 на хвилину в групу
+TELEGRAM_CHAT_RATE = get_env_variable("TELEGRAM_CHAT_RATE", float, required=False) or 1.0
+TELEGRAM_GROUP_RATE = get_env_variable("TELEGRAM_GROUP_RATE", float, required=False) or 20 / 60
+TELEGRAM_GLOBAL_RATE = 25.0     # повідомлень на секунду загалом (ліміт Telegram — 30)
+TELEGRAM_MESSAGE_LIMIT = 4096   # максимальна довжина повідомлення
+DELIVERY_RETRY_DELAY = 30       # секунди (пауза після помилки мережі Telegram)
+
+# Режим дайджесту: кілька тендерів в одному повідомленні
+DIGEST_MODE = (get_env_variable("DIGEST_MODE", str, required=False) or "").lower() in ("1", "true", "yes")
+DIGEST_MAX_ITEMS = 50           # максимум тендерів, що пакуються за один раз
+
+# --- Розклад авто-перевірки ---
+POLL_INTERVAL_BUSY = 300        # секунди (базовий інтервал у робочі години)
+POLL_INTERVAL_IDLE = 1800       # секунди (базовий інтервал уночі та у вихідні)
+POLL_INTERVAL_MIN = 60          # секунди (найкоротший інтервал)
+POLL_INTERVAL_MAX = 3600        # секунди (найдовший інтервал)
+POLL_TIMEZONE = "Europe/Kiev"
+BUSINESS_HOURS = (8, 19)        # години початку та кінця робочого дня
+BUSINESS_DAYS = range(0, 5)     # понеділок–п'ятниця
+ACTIVITY_SCALE = 20             # нових тендерів за обхід, що вдвічі скорочують інтервал
+ACTIVITY_SMOOTHING = 0.3        # вага останнього обходу в середній активності
+ERROR_BACKOFF_MAX = 3600        # секунди (максимальна пауза після помилок)
+
 # --- Налаштування бота ---
-CHECK_INTERVAL = 600  # 10 хвилин (інтервал авто-перевірки)
 REQUEST_TIMEOUT = 3   # секунди (таймаут запитів)
 REQUEST_DELAY = 0.1   # секунди (затримка між запитами)
+
+# --- Пул HTTP-з'єднань ---
+HTTP_POOL_LIMIT = 20           # максимум одночасних з'єднань
+HTTP_POOL_LIMIT_PER_HOST = 16  # максимум з'єднань до одного хоста
+HTTP_KEEPALIVE_TIMEOUT = 30    # секунди (час життя keep-alive з'єднання)
+
+# --- Метрики та профілювання ---
+# Локальний ендпоінт Prometheus /metrics (METRICS_PORT=0 вимикає його)
+METRICS_HOST = get_env_variable("METRICS_HOST", str, required=False) or "127.0.0.1"
+_metrics_port = get_env_variable("METRICS_PORT", int, required=False)
+METRICS_PORT = 9108 if _metrics_port is None else _metrics_port
+
+# Чати, яким доступні /stats та /profile (через кому; за замовчуванням — CHAT_ID)
+ADMIN_CHAT_IDS = [
+    int(chat_id) for chat_id in (get_env_variable("ADMIN_CHAT_IDS", str, required=False) or "").split(",")
+    if chat_id.strip()
+] or ([CHAT_ID] if CHAT_ID else [])
+
+# Профілювання першого обходу після запуску (далі — командою /profile)
+PROFILE_SWEEP = (get_env_variable("PROFILE_SWEEP", str, required=False) or "").lower() in ("1", "true", "yes")
+PROFILE_INTERVAL = 0.005        # секунди (проміжок між знімками стека)
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
@@ -0,0 +1,271 @@
+"""
+delivery.py — черга надсилання повідомлень у Telegram.
+
+Черга відокремлена від обходу стрічки: обхід лише додає тендери до таблиці
+`outbox` у сховищі підписок, а окремі задачі (по одній на чат) надсилають їх
+з урахуванням лімітів Telegram:
+- відро з токенами на кожен чат (для груп і каналів — повільніше) та спільне глобальне відро
+- пауза чату на час, вказаний у `RetryAfter`; якщо Telegram одночасно
+  обмежує кілька чатів, ліміт вважається глобальним і пауза діє на всі чати
+- запис у журнал доставки лише після успішного надсилання (at-least-once)
+- повідомлення, яке Telegram відхилив (BadRequest), надсилається по одному
+  тендеру, а наостанок простим текстом, і лише тоді відкидається
+
+У режимі дайджесту кілька тендерів об'єднуються в одне повідомлення
+довжиною до TELEGRAM_MESSAGE_LIMIT символів.
+"""
+
+import time
+import asyncio
+import logging
+from datetime import timedelta
+from typing import List, Dict, Tuple, Callable, Optional
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+
+from config import (
+    TELEGRAM_CHAT_RATE, TELEGRAM_GROUP_RATE, TELEGRAM_GLOBAL_RATE, TELEGRAM_MESSAGE_LIMIT,
+    DIGEST_MODE, DIGEST_MAX_ITEMS, DELIVERY_RETRY_DELAY
+)
+from metrics import STAGE_SECONDS, MESSAGES
+from ratelimit import TokenBucket
+from subscriptions import SubscriptionStore, OutboxItem
+from tender_api import TenderMatch
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SEPARATOR = "\n\n"
+
+# Скільки чатів мають одночасно отримати RetryAfter, щоб пауза стала глобальною
+GLOBAL_PAUSE_CHATS = 3
+
+
+def pack_digest(items: List[OutboxItem], limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[Tuple[str, List[OutboxItem]]]:
+    """
+    Пакує повідомлення про тендери у дайджести, не довші за `limit` символів.
+
+    Args:
+        items (list): повідомлення у порядку надсилання
+        limit (int): максимальна довжина одного повідомлення
+
+    Returns:
+        list: пари (текст дайджесту, тендери, що до нього увійшли)
+    """
+    digests = []
+    texts: List[str] = []
+    batch: List[OutboxItem] = []
+    length = 0
+
+    for item in items:
+        text = item.text[:limit]
+        extra = len(text) + (len(DIGEST_SEPARATOR) if texts else 0)
+        if texts and length + extra > limit:
+            digests.append((DIGEST_SEPARATOR.join(texts), batch))
+            texts, batch, length = [], [], 0
+            extra = len(text)
+        texts.append(text)
+        batch.append(item)
+        length += extra
+
+    if texts:
+        digests.append((DIGEST_SEPARATOR.join(texts), batch))
+    return digests
+
+
+class DeliveryQueue:
+    """
+    Черга надсилання з обмеженням частоти та гарантією at-least-once.
+
+    Attributes:
+        bot (telegram.Bot): бот для надсилання
+        store (SubscriptionStore): сховище з чергою `outbox` та журналом доставки
+        digest (bool): чи об'єднувати тендери у дайджести
+        on_blocked (callable | None): викликається з ID чату, який заблокував бота
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        store: SubscriptionStore,
+        digest: bool = DIGEST_MODE,
+        chat_rate: float = TELEGRAM_CHAT_RATE,
+        group_rate: float = TELEGRAM_GROUP_RATE,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        on_blocked: Optional[Callable[[int], None]] = None,
+    ):
+        self.bot = bot
+        self.store = store
+        self.digest = digest
+        self.on_blocked = on_blocked
+        self._chat_rate = chat_rate
+        self._group_rate = group_rate
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        # Кінець паузи RetryAfter для окремих чатів та для всіх чатів (time.monotonic)
+        self._paused_until: Dict[int, float] = {}
+        self._global_paused_until = 0.0
+
+    def start(self) -> None:
+        """Відновлює надсилання повідомлень, що залишилися в черзі після перезапуску."""
+        for chat_id in self.store.pending_chats():
+            self._wake(chat_id)
+
+    async def stop(self) -> None:
+        """Зупиняє задачі надсилання; ненадіслане залишається в черзі."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def enqueue(self, matches: List[TenderMatch]) -> Dict[int, int]:
+        """
+        Розподіляє знайдені тендери по чатах підписників і ставить їх у чергу.
+
+        Args:
+            matches (list): тендери з підписками, яким вони відповідають
+
+        Returns:
+            Dict[int, int]: кількість тендерів, доданих у чергу кожного чату
+        """
+        by_chat: Dict[int, List[OutboxItem]] = {}
+        for match in matches:
+            # Текст формується лише тут, при передачі тендера у чергу надсилання
+            record = match.record
+            item = OutboxItem(record.id, record.date_modified, record.render())
+            for subscription_id in match.subscriptions:
+                by_chat.setdefault(int(subscription_id), []).append(item)
+
+        enqueued = {}
+        for chat_id, items in by_chat.items():
+            enqueued[chat_id] = self.store.enqueue(chat_id, items)
+            if enqueued[chat_id]:
+                self._wake(chat_id)
+        return enqueued
+
+    def _wake(self, chat_id: int) -> None:
+        """Запускає задачу надсилання для чату, якщо вона ще не працює."""
+        worker = self._workers.get(chat_id)
+        if worker is None or worker.done():
+            self._workers[chat_id] = asyncio.create_task(self._drain(chat_id))
+
+    async def _throttle(self, chat_id: int) -> None:
+        """Чекає на дозвіл лімітів чату, глобального ліміту та паузи RetryAfter."""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            # ID груп і каналів у Telegram від'ємні
+            rate = self._group_rate if chat_id < 0 else self._chat_rate
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate)
+
+        delay = max(self._paused_until.get(chat_id, 0.0), self._global_paused_until) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        await bucket.acquire()
+        await self._global_bucket.acquire()
+
+    def _pause(self, chat_id: int, retry_after: float) -> None:
+        """
+        Призупиняє надсилання в чат після RetryAfter.
+
+        Якщо на паузі вже щонайменше GLOBAL_PAUSE_CHATS чатів, ліміт, найімовірніше,
+        глобальний, тож пауза поширюється на всі чати.
+
+        Args:
+            chat_id (int): ID чату
+            retry_after (float): тривалість паузи (секунди)
+        """
+        now = time.monotonic()
+        until = now + retry_after
+        self._paused_until = {chat: end for chat, end in self._paused_until.items() if end > now}
+        self._paused_until[chat_id] = max(self._paused_until.get(chat_id, 0.0), until)
+
+        if len(self._paused_until) >= GLOBAL_PAUSE_CHATS and until > self._global_paused_until:
+            logger.warning(f"RetryAfter одночасно у {len(self._paused_until)} чатах: пауза для всіх чатів")
+            self._global_paused_until = until
+
+    async def _send(self, chat_id: int, text: str, parse_mode: Optional[str] = "Markdown") -> None:
+        """
+        Надсилає одне повідомлення, повторюючи його після RetryAfter.
+
+        Args:
+            chat_id (int): ID чату
+            text (str): текст повідомлення
+            parse_mode (str | None): розмітка (None — простий текст)
+
+        Raises:
+            telegram.error.TelegramError: помилки, крім RetryAfter
+        """
+        while True:
+            await self._throttle(chat_id)
+            try:
+                with STAGE_SECONDS.time(stage="send"):
+                    await self.bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+                MESSAGES.inc(result="sent")
+                return
+            except RetryAfter as e:
+                MESSAGES.inc(result="retry_after")
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                logger.warning(f"Telegram просить зачекати {retry_after} с (чат {chat_id})")
+                self._pause(chat_id, float(retry_after))
+
+    async def _deliver(self, chat_id: int, text: str, batch: List[OutboxItem]) -> None:
+        """
+        Надсилає повідомлення та прибирає його тендери з черги.
+
+        Якщо Telegram відхиляє повідомлення (BadRequest), дайджест розбивається
+        на окремі тендери, а окремий тендер надсилається простим текстом.
+        Відкидається лише те, що не вдалося надіслати навіть так.
+
+        Raises:
+            telegram.error.TelegramError: помилки, крім BadRequest та RetryAfter
+        """
+        try:
+            await self._send(chat_id, text)
+        except BadRequest as e:
+            if len(batch) > 1:
+                logger.warning(f"Telegram відхилив дайджест у чат {chat_id} ({e}), надсилаю тендери окремо")
+                for item in batch:
+                    await self._deliver(chat_id, item.text[:TELEGRAM_MESSAGE_LIMIT], [item])
+                return
+
+            logger.warning(f"Telegram відхилив повідомлення у чат {chat_id} ({e}), надсилаю простим текстом")
+            try:
+                await self._send(chat_id, text, parse_mode=None)
+            except BadRequest as e:
+                # Повідомлення, яке Telegram відхиляє навіть без розмітки, не стане валідним від повторів
+                MESSAGES.inc(result="rejected")
+                logger.error(f"Telegram відхилив повідомлення у чат {chat_id}: {e}")
+                self.store.discard(chat_id, batch)
+                return
+
+        self.store.complete(chat_id, batch)
+
+    async def _drain(self, chat_id: int) -> None:
+        """Надсилає всі повідомлення з черги чату, доки вона не спорожніє."""
+        batch_size = DIGEST_MAX_ITEMS if self.digest else 1
+
+        while True:
+            items = self.store.pending(chat_id, batch_size)
+            if not items:
+                return
+
+            messages = pack_digest(items) if self.digest else [(items[0].text, items)]
+            for text, batch in messages:
+                try:
+                    await self._deliver(chat_id, text, batch)
+                except Forbidden:
+                    MESSAGES.inc(result="blocked")
+                    logger.warning(f"Бот заблокований у чаті {chat_id}, підписку скасовано")
+                    self.store.unsubscribe(chat_id)
+                    if self.on_blocked:
+                        self.on_blocked(chat_id)
+                    return
+                except TelegramError as e:
+                    MESSAGES.inc(result="error")
+                    logger.error(f"Помилка надсилання у чат {chat_id}: {e}, повтор через {DELIVERY_RETRY_DELAY} с")
+                    await asyncio.sleep(DELIVERY_RETRY_DELAY)
+                    break
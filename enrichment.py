@@ -0,0 +1,144 @@
+"""
+enrichment.py — етап збагачення тендерів повними даними.
+
+Стрічка `/tenders` повертає лише мінімальні записи (ID та dateModified) і
+поля, дозволені через `opt_fields`. Фільтрам і повідомленням потрібні регіон
+замовника, CPV-код, назва та бюджет, тому тендери, яким бракує цих полів,
+дозавантажуються з `/tenders/{id}` через пул з обмеженою паралельністю,
+повторними спробами з експоненційною затримкою та лімітом частоти на хост.
+"""
+
+import random
+import asyncio
+import logging
+from typing import List, Dict, Tuple, Optional
+
+import aiohttp
+
+from config import (
+    BASE_URL, ENRICH_CONCURRENCY, ENRICH_RATE_LIMIT, ENRICH_RETRIES, ENRICH_BACKOFF
+)
+from ratelimit import HostRateLimiter
+from records import TenderRecord
+
+logger = logging.getLogger(__name__)
+
+# Статуси відповіді, після яких має сенс повторити запит
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Статуси, які означають, що тендера більше немає: повторювати запит марно
+MISSING_STATUSES = {404, 410}
+
+
+class TenderEnricher:
+    """
+    Пул для паралельного дозавантаження повних даних тендерів.
+
+    Attributes:
+        concurrency (int): максимум одночасних запитів
+        retries (int): кількість повторних спроб після невдачі
+        backoff (float): базова затримка між спробами (секунди)
+        limiter (HostRateLimiter): ліміт частоти запитів до кожного хоста
+    """
+
+    def __init__(
+        self,
+        concurrency: int = ENRICH_CONCURRENCY,
+        rate_limit: float = ENRICH_RATE_LIMIT,
+        retries: int = ENRICH_RETRIES,
+        backoff: float = ENRICH_BACKOFF,
+    ):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = HostRateLimiter(rate_limit)
+
+    async def _fetch_details(self, session: aiohttp.ClientSession, tender_id: str) -> Dict:
+        """
+        Завантажує повні дані тендера з повторними спробами.
+
+        Args:
+            session (aiohttp.ClientSession): HTTP-сесія
+            tender_id (str): ID тендера
+
+        Returns:
+            dict: повний запис тендера
+
+        Raises:
+            aiohttp.ClientError: якщо всі спроби завершились помилкою мережі чи статусу
+            asyncio.TimeoutError: якщо остання спроба перевищила таймаут
+            ValueError: якщо тіло відповіді не є коректним JSON
+        """
+        url = f"{BASE_URL}/{tender_id}"
+
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire(url)
+            delay = self.backoff * (2 ** attempt) * (1 + random.random())
+            try:
+                async with session.get(url) as response:
+                    if response.status in RETRY_STATUSES and attempt < self.retries:
+                        retry_after = response.headers.get("Retry-After", "")
+                        if retry_after.isdigit():
+                            delay = max(delay, float(retry_after))
+                        logger.debug(f"Статус {response.status} для {tender_id}, повтор через {delay:.1f} с")
+                    else:
+                        response.raise_for_status()
+                        data = await response.json()
+                        return data.get("data", {})
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.retries:
+                    raise
+                logger.debug(f"Помилка з'єднання для {tender_id}, повтор через {delay:.1f} с")
+
+            await asyncio.sleep(delay)
+
+        raise aiohttp.ClientError(f"Вичерпано спроби завантаження тендера {tender_id}")
+
+    async def enrich(
+        self, session: aiohttp.ClientSession, records: List[TenderRecord]
+    ) -> Tuple[List[TenderRecord], List[TenderRecord], List[TenderRecord]]:
+        """
+        Замінює записи, яким бракує потрібних полів, записами з повних даних API.
+
+        Повна відповідь одразу проєктується у `TenderRecord` і відкидається.
+        Тендери, які не вдалося дозавантажити, повертаються окремо, щоб
+        викликач міг повторити їх пізніше. Тендери, яких API більше не
+        знаходить (404, 410), теж повертаються окремо: повторювати їх марно.
+
+        Args:
+            session (aiohttp.ClientSession): HTTP-сесія
+            records (list): записи зі стрічки
+
+        Returns:
+            tuple: (повні записи в початковому порядку, записи, які не вдалося
+            дозавантажити, записи тендерів, яких більше немає)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        missing: List[TenderRecord] = []
+
+        async def worker(record: TenderRecord) -> Optional[TenderRecord]:
+            if not record.needs_details:
+                return record
+            async with semaphore:
+                try:
+                    details = await self._fetch_details(session, record.id)
+                except aiohttp.ClientResponseError as e:
+                    if e.status in MISSING_STATUSES:
+                        logger.warning(f"Тендер {record.id} не знайдено (статус {e.status}), його пропущено")
+                        missing.append(record)
+                    else:
+                        logger.warning(f"Не вдалося дозавантажити тендер {record.id}: {e}")
+                    return None
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    # ValueError — зокрема json.JSONDecodeError для обрізаної або не-JSON відповіді
+                    logger.warning(f"Не вдалося дозавантажити тендер {record.id}: {e}")
+                    return None
+            return TenderRecord.from_api({"id": record.id, **details})
+
+        results = await asyncio.gather(*(worker(record) for record in records))
+        missing_ids = {record.id for record in missing}
+        enriched = [result for result in results if result is not None]
+        failed = [
+            record for record, result in zip(records, results)
+            if result is None and record.id not in missing_ids
+        ]
+        return enriched, failed, missing
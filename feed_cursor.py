@@ -0,0 +1,93 @@
+"""
+feed_cursor.py — збереження позиції у стрічці змін ProZorro між запусками.
+
+Стрічка `/tenders` відсортована за часом зміни, а поле `next_page.offset`
+вказує, звідки продовжувати. Модуль зберігає цей курсор та водяний знак
+`dateModified` на диск, щоб кожен цикл перевірки отримував лише нові зміни,
+а перезапуск контейнера не повертав обхід на початок.
+
+Разом з курсором зберігаються тендери, які не вдалося дозавантажити: курсор
+уже пройшов їхні сторінки, тож наступні обходи повторюють їх окремо.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List, Optional
+
+from config import CURSOR_FILE
+from records import to_utc
+
+logger = logging.getLogger(__name__)
+
+# Режими холодного старту (коли збереженого курсора ще немає)
+COLD_START_CATCHUP = "catchup"  # обхід стрічки з самого початку
+COLD_START_LATEST = "latest"    # пропуск історії, старт з поточного моменту
+COLD_START_MODES = (COLD_START_CATCHUP, COLD_START_LATEST)
+
+
+class FeedCursor:
+    """
+    Курсор стрічки змін, що зберігається у JSON-файлі.
+
+    Attributes:
+        path (str): шлях до файлу курсора
+        offset (str | None): значення `next_page.offset` для наступного запиту
+        date_modified (str | None): найбільший `dateModified` серед оброблених тендерів (в UTC)
+        retry (dict): тендери для повторного дозавантаження — `{id: [dateModified, кількість спроб]}`
+    """
+
+    def __init__(self, path: str = CURSOR_FILE):
+        self.path = path
+        self.offset: Optional[str] = None
+        self.date_modified: Optional[str] = None
+        self.retry: Dict[str, List] = {}
+        self._load()
+
+    @property
+    def is_empty(self) -> bool:
+        """bool: True, якщо курсор ще ні разу не зберігався."""
+        return not self.offset
+
+    def _load(self) -> None:
+        """Зчитує курсор з диска; пошкоджений файл ігнорується."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Не вдалося прочитати курсор {self.path}: {e}")
+            return
+
+        self.offset = state.get("offset")
+        self.date_modified = to_utc(state.get("date_modified"))
+        self.retry = state.get("retry") or {}
+        logger.info(f"Відновлено курсор стрічки: offset={self.offset}, dateModified={self.date_modified}")
+
+    def update(self, offset: str, date_modified: Optional[str] = None) -> None:
+        """
+        Пересуває курсор та водяний знак і одразу зберігає їх на диск.
+
+        Args:
+            offset (str): курсор наступної сторінки з відповіді API
+            date_modified (str | None): найбільший `dateModified` на сторінці
+        """
+        self.offset = offset
+        # API віддає київський час, зсув якого змінюється з переходом на літній час,
+        # тому порівнюються лише дати, переведені в UTC
+        date_modified = to_utc(date_modified)
+        if date_modified and (not self.date_modified or date_modified > self.date_modified):
+            self.date_modified = date_modified
+        self.save()
+
+    def save(self) -> None:
+        """Атомарно записує курсор у файл (через тимчасовий файл)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"offset": self.offset, "date_modified": self.date_modified, "retry": self.retry}, f)
+        os.replace(tmp_path, self.path)
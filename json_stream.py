@@ -0,0 +1,135 @@
+"""
+json_stream.py — інкрементальний розбір сторінок стрічки ProZorro.
+
+Сторінка стрічки має вигляд `{"data": [...], "next_page": {...}, ...}`.
+`ListingParser` отримує тіло відповіді частинами та повертає елементи масиву
+`data` одразу, щойно вони повністю прочитані, не тримаючи в пам'яті все тіло
+та весь розібраний масив одночасно. Решта ключів верхнього рівня
+зберігається в `meta`.
+"""
+
+import json
+from typing import Any, Dict, List
+
+_DECODER = json.JSONDecoder()
+_SKIP = " \t\n\r,"
+
+# Стани розбору
+_START, _KEY, _COLON, _VALUE, _ARRAY, _DONE = range(6)
+
+
+class ListingParser:
+    """
+    Потоковий розбирач об'єкта верхнього рівня з масивом елементів.
+
+    Attributes:
+        array_key (str): ключ масиву, елементи якого повертаються поштучно
+        meta (dict): інші ключі верхнього рівня (наприклад, `next_page`)
+    """
+
+    def __init__(self, array_key: str = "data"):
+        self.array_key = array_key
+        self.meta: Dict[str, Any] = {}
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key = ""
+
+    def _skip(self) -> None:
+        """Пропускає пробіли та коми перед наступним токеном."""
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in _SKIP:
+            pos += 1
+        self._pos = pos
+
+    def _decode(self, final: bool):
+        """
+        Розбирає одне JSON-значення з поточної позиції.
+
+        Returns:
+            tuple | None: (значення, позиція після нього) або None, якщо даних ще замало
+        """
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # Число в самому кінці буфера могло бути обрізане — чекаємо на наступну частину
+        # (рядки, об'єкти та масиви закінчуються власним роздільником)
+        if end == len(self._buffer) and not final and self._buffer[end - 1] in "0123456789.eE+-":
+            return None
+        return value, end
+
+    def feed(self, chunk: str, final: bool = False) -> List[Any]:
+        """
+        Додає чергову частину тіла відповіді.
+
+        Args:
+            chunk (str): декодований фрагмент тіла
+            final (bool): True для останнього фрагмента
+
+        Returns:
+            list: елементи масиву, що повністю прочитані у цьому фрагменті
+
+        Raises:
+            json.JSONDecodeError: якщо тіло не є коректним JSON
+        """
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        items = []
+
+        while True:
+            self._skip()
+            if self._pos >= len(self._buffer) or self._state == _DONE:
+                break
+            char = self._buffer[self._pos]
+
+            if self._state == _START:
+                if char != "{":
+                    raise json.JSONDecodeError("Очікувався об'єкт", self._buffer, self._pos)
+                self._pos += 1
+                self._state = _KEY
+
+            elif self._state == _KEY:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                decoded = self._decode(final)
+                if decoded is None:
+                    break
+                self._key, self._pos = decoded
+                self._state = _COLON
+
+            elif self._state == _COLON:
+                if char != ":":
+                    raise json.JSONDecodeError("Очікувалась двокрапка", self._buffer, self._pos)
+                self._pos += 1
+                self._state = _VALUE
+
+            elif self._state == _VALUE:
+                if self._key == self.array_key and char == "[":
+                    self._pos += 1
+                    self._state = _ARRAY
+                    continue
+                decoded = self._decode(final)
+                if decoded is None:
+                    break
+                self.meta[self._key], self._pos = decoded
+                self._state = _KEY
+
+            elif self._state == _ARRAY:
+                if char == "]":
+                    self._pos += 1
+                    self._state = _KEY
+                    continue
+                decoded = self._decode(final)
+                if decoded is None:
+                    break
+                item, self._pos = decoded
+                items.append(item)
+
+        if final and self._state != _DONE:
+            raise json.JSONDecodeError("Неочікуваний кінець відповіді", self._buffer, self._pos)
+        return items
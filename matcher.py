@@ -0,0 +1,247 @@
+"""
+matcher.py — скомпільований механізм зіставлення тендерів з підписками.
+
+Усі підписки компілюються один раз у дві структури:
+- префіксне дерево CPV-кодів з урахуванням рівня ієрархії класифікатора
+- символьне дерево нормалізованих назв регіонів та ключових слів
+
+Вартість перевірки одного тендера залежить від довжини CPV-коду та адреси,
+а не від кількості підписок.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Set, Iterable
+
+from config import CPV_CODES, ALLOWED_REGIONS, ALLOWED_REGION_KEYWORDS
+from records import TenderRecord
+
+# Мінімальна кількість значущих цифр CPV-коду (рівень розділу)
+CPV_MIN_LEVEL = 2
+
+_NON_WORD_RE = re.compile(r"[^\w']+")
+_APOSTROPHES_RE = re.compile(r"[’ʼ`‘]")
+
+DEFAULT_SUBSCRIPTION_ID = "default"
+
+
+def cpv_prefix(code: str) -> str:
+    """
+    Повертає значущу частину CPV-коду відповідно до його рівня в ієрархії.
+
+    CPV-код має 8 цифр (плюс контрольну після дефіса); нулі в кінці означають,
+    що код позначає цілу групу: "15420000" — група "1542", "03000000" — розділ "03".
+
+    Args:
+        code (str): CPV-код, наприклад "15420000-8"
+
+    Returns:
+        str: префікс, з якого мають починатися коди всередині групи
+    """
+    digits = code.split("-", 1)[0].strip()[:8]
+    prefix = digits.rstrip("0")
+    return digits[:max(len(prefix), CPV_MIN_LEVEL)]
+
+
+def normalize_region(text: str) -> str:
+    """
+    Нормалізує назву регіону чи адресу для порівняння.
+
+    Args:
+        text (str): довільний рядок з назвою регіону
+
+    Returns:
+        str: рядок у нижньому регістрі зі словами, розділеними одним пробілом
+    """
+    text = _APOSTROPHES_RE.sub("'", text.casefold())
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+@dataclass
+class Subscription:
+    """
+    Набір фільтрів однієї підписки.
+
+    Порожній список означає відсутність обмеження за відповідним критерієм.
+
+    Attributes:
+        id (str): ідентифікатор підписки
+        cpv_codes (list): CPV-коди або групи кодів
+        regions (list): назви регіонів чи ключові слова (збіг з початком слова)
+    """
+    id: str
+    cpv_codes: List[str] = field(default_factory=list)
+    regions: List[str] = field(default_factory=list)
+
+
+def default_subscription() -> Subscription:
+    """Повертає підписку з глобальними фільтрами з config.py."""
+    return Subscription(
+        id=DEFAULT_SUBSCRIPTION_ID,
+        cpv_codes=list(CPV_CODES),
+        regions=list(ALLOWED_REGIONS) + list(ALLOWED_REGION_KEYWORDS),
+    )
+
+
+class _TrieNode:
+    """Вузол префіксного дерева з множиною підписок, що закінчуються у ньому."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.subscriptions: Set[str] = set()
+
+    def insert(self, key: str, subscription_id: str) -> None:
+        node = self
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+        node.subscriptions.add(subscription_id)
+
+    def collect(self, text: str, start: int = 0) -> Set[str]:
+        """Повертає підписки всіх ключів, що є префіксами `text[start:]`."""
+        found = set(self.subscriptions)
+        node = self
+        for i in range(start, len(text)):
+            node = node.children.get(text[i])
+            if node is None:
+                break
+            found |= node.subscriptions
+        return found
+
+
+class SubscriptionMatcher:
+    """
+    Скомпільований набір підписок.
+
+    Регіон підписки збігається з адресою, якщо її слова (після нормалізації)
+    містять слова регіону поспіль, причому останнє слово регіону може бути
+    початком слова адреси: "Київ" збігається з "Київська область",
+    "м. Київ" — з "м. Київ".
+
+    Attributes:
+        subscriptions (dict): підписки за їхніми ID
+    """
+
+    def __init__(self, subscriptions: Iterable[Subscription]):
+        self.subscriptions: Dict[str, Subscription] = {}
+        self._cpv_trie = _TrieNode()
+        self._region_trie = _TrieNode()
+        # Підписки без обмеження за відповідним критерієм
+        self._any_cpv: Set[str] = set()
+        self._any_region: Set[str] = set()
+
+        for subscription in subscriptions:
+            self.add(subscription)
+
+    def add(self, subscription: Subscription) -> None:
+        """
+        Додає підписку до скомпільованих індексів.
+
+        Args:
+            subscription (Subscription): підписка з фільтрами
+        """
+        self.subscriptions[subscription.id] = subscription
+
+        if subscription.cpv_codes:
+            for code in subscription.cpv_codes:
+                self._cpv_trie.insert(cpv_prefix(code), subscription.id)
+        else:
+            self._any_cpv.add(subscription.id)
+
+        regions = [normalize_region(region) for region in subscription.regions]
+        regions = [region for region in regions if region]
+        if regions:
+            for region in regions:
+                self._region_trie.insert(region, subscription.id)
+        else:
+            self._any_region.add(subscription.id)
+
+    def match_cpv(self, cpv_code: str) -> Set[str]:
+        """
+        Повертає підписки, чиї CPV-фільтри охоплюють код.
+
+        Args:
+            cpv_code (str): CPV-код тендера
+
+        Returns:
+            set: ID підписок
+        """
+        found = set(self._any_cpv)
+        if cpv_code:
+            found |= self._cpv_trie.collect(cpv_code.split("-", 1)[0])
+        return found
+
+    def match_region(self, address: str) -> Set[str]:
+        """
+        Повертає підписки, чиї регіональні фільтри охоплюють адресу.
+
+        Args:
+            address (str): регіон чи адреса замовника
+
+        Returns:
+            set: ID підписок
+        """
+        found = set(self._any_region)
+        text = normalize_region(address or "")
+        if not text:
+            return found
+
+        # Перевіряємо збіги, що починаються з кожного слова адреси
+        start = 0
+        while start < len(text):
+            found |= self._region_trie.collect(text, start)
+            next_space = text.find(" ", start)
+            if next_space == -1:
+                break
+            start = next_space + 1
+        return found
+
+    def match(self, tender: TenderRecord) -> Set[str]:
+        """
+        Повертає всі підписки, яким відповідає тендер.
+
+        Args:
+            tender (TenderRecord): запис тендера
+
+        Returns:
+            set: ID підписок
+        """
+        matched = self.match_cpv(tender.cpv or "")
+        if not matched:
+            return matched
+        return matched & self.match_region(tender.region or "")
+
+    def match_many(self, tenders: Iterable[TenderRecord]) -> Dict[str, Set[str]]:
+        """
+        Пакетне зіставлення сторінки тендерів.
+
+        Однакові CPV-коди та регіони на сторінці обчислюються лише раз.
+
+        Args:
+            tenders (iterable): записи тендерів
+
+        Returns:
+            dict: ID тендера -> непорожня множина ID підписок
+        """
+        cpv_cache: Dict[str, Set[str]] = {}
+        region_cache: Dict[str, Set[str]] = {}
+        results = {}
+
+        for tender in tenders:
+            cpv_code = tender.cpv or ""
+            matched = cpv_cache.get(cpv_code)
+            if matched is None:
+                matched = cpv_cache[cpv_code] = self.match_cpv(cpv_code)
+            if not matched:
+                continue
+
+            address = tender.region or ""
+            regions = region_cache.get(address)
+            if regions is None:
+                regions = region_cache[address] = self.match_region(address)
+
+            matched = matched & regions
+            if matched:
+                results[tender.id] = matched
+        return results
@@ -0,0 +1,326 @@
+"""
+metrics.py — вбудовані метрики бота у форматі Prometheus.
+
+Містить прості лічильники (`Counter`), датчики (`Gauge`) та гістограми
+затримок (`Histogram`) з мітками, реєстр, що віддає їх у текстовому форматі
+Prometheus, та `MetricsServer` — локальний HTTP-ендпоінт `/metrics` на aiohttp.
+
+Метрики етапів обходу та надсилання оголошені тут же, щоб модулі бота
+імпортували готові об'єкти:
+- `STAGE_SECONDS` — тривалість етапів (fetch, parse, dedup, enrich, mirror, match, mark, send)
+- `SWEEP_SECONDS` — тривалість усього обходу стрічки
+- `PAGES`, `TENDERS`, `MESSAGES`, `SWEEPS` — лічильники подій
+- `SEEN_SIZE`, `OUTBOX_DEPTH`, `MIRROR_SIZE`, `SUBSCRIPTIONS` — датчики,
+  значення яких обчислюється під час збору (див. `Gauge.set_function`)
+"""
+
+import bisect
+import logging
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+from config import METRICS_HOST, METRICS_PORT
+
+logger = logging.getLogger(__name__)
+
+# Межі кошиків гістограми затримок (секунди)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Форматує мітки як `{name="value",...}` з екрануванням спецсимволів."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """
+    Базовий клас метрики з мітками.
+
+    Attributes:
+        name (str): назва метрики у Prometheus
+        documentation (str): опис (рядок HELP)
+        labelnames (tuple): назви міток
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        """Перетворює мітки виклику на ключ; набір міток має збігатися з `labelnames`."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Метрика {self.name} очікує мітки {self.labelnames}, отримано {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterator[Tuple[str, LabelValues, float, Sequence[str]]]:
+        """Повертає зразки (суфікс назви, значення міток, значення, назви міток)."""
+
+    def render(self) -> List[str]:
+        """Рядки метрики у текстовому форматі Prometheus."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, value, names in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Лічильник, що лише зростає."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        for values, value in sorted(self._values.items()):
+            yield "_total", values, value, self.labelnames
+
+
+class Gauge(Metric):
+    """
+    Датчик поточного значення.
+
+    Значення можна задавати напряму (`set`) або функцією, яка викликається
+    під час кожного збору метрик (`set_function`) — так розмір сховищ не
+    треба оновлювати після кожної зміни.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def get(self) -> float:
+        if self._function is None:
+            return self._value
+        try:
+            return self._function()
+        except Exception as e:
+            # Зламаний датчик не повинен ламати весь збір метрик
+            logger.warning(f"Не вдалося обчислити {self.name}: {e}")
+            return float("nan")
+
+    def samples(self):
+        yield "", (), self.get(), ()
+
+
+class Histogram(Metric):
+    """
+    Гістограма з фіксованими кошиками (кумулятивними, як у Prometheus).
+
+    Attributes:
+        buckets (tuple): верхні межі кошиків
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Для кожного набору міток: лічильники кошиків (останній — +Inf), сума, кількість
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Контекстний менеджер, що записує тривалість блоку (секунди)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def sum(self, **labels: str) -> float:
+        return self._sums.get(self._key(labels), 0.0)
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """
+        Оцінює квантиль за кошиками лінійною інтерполяцією (як `histogram_quantile`).
+
+        Args:
+            q (float): квантиль від 0 до 1
+
+        Returns:
+            float | None: оцінка або None, якщо спостережень немає
+        """
+        counts = self._counts.get(self._key(labels))
+        if not counts or not sum(counts):
+            return None
+
+        rank = q * sum(counts)
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    # Значення вище за останню межу: краще оцінки немає
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def label_values(self) -> List[LabelValues]:
+        return sorted(self._counts)
+
+    def samples(self):
+        bucket_names = self.labelnames + ("le",)
+        for values in sorted(self._counts):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self._counts[values]):
+                cumulative += count
+                yield "_bucket", values + (_format_value(bound),), cumulative, bucket_names
+            yield "_sum", values, self._sums[values], self.labelnames
+            yield "_count", values, cumulative, self.labelnames
+
+
+class Registry:
+    """Набір метрик, що віддаються разом."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} вже зареєстрована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Формує всі метрики у текстовому форматі Prometheus.
+
+        Returns:
+            str: тіло відповіді для `/metrics`
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- Етапи обходу та надсилання ---
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "tender_bot_stage_seconds",
+    "Тривалість етапів обробки: fetch (мережа), parse, dedup, enrich, mirror, match, mark, send",
+    ["stage"],
+))
+SWEEP_SECONDS = REGISTRY.register(Histogram(
+    "tender_bot_sweep_seconds", "Тривалість одного обходу стрічки",
+))
+SWEEPS = REGISTRY.register(Counter(
+    "tender_bot_sweeps", "Обходи стрічки за результатом (complete, partial, error)", ["result"],
+))
+PAGES = REGISTRY.register(Counter(
+    "tender_bot_pages", "Запити сторінок стрічки за результатом (ok, not_modified, throttled, error)", ["result"],
+))
+TENDERS = REGISTRY.register(Counter(
+    "tender_bot_tenders", "Тендери на етапах обробки (fetched, new, matched)", ["stage"],
+))
+MESSAGES = REGISTRY.register(Counter(
+    "tender_bot_messages", "Спроби надсилання у Telegram за результатом (sent, retry_after, blocked, rejected, error)",
+    ["result"],
+))
+
+# --- Розміри сховищ і черг ---
+SEEN_SIZE = REGISTRY.register(Gauge("tender_bot_seen_size", "Записів у сховищі оброблених тендерів"))
+OUTBOX_DEPTH = REGISTRY.register(Gauge("tender_bot_outbox_depth", "Повідомлень у черзі надсилання"))
+MIRROR_SIZE = REGISTRY.register(Gauge("tender_bot_mirror_size", "Тендерів у локальному дзеркалі"))
+SUBSCRIPTIONS = REGISTRY.register(Gauge("tender_bot_subscriptions", "Активних підписок"))
+
+
+class MetricsServer:
+    """
+    Локальний HTTP-ендпоінт `/metrics` для Prometheus.
+
+    Attributes:
+        host (str): адреса прослуховування
+        port (int): порт
+        registry (Registry): метрики, що віддаються
+    """
+
+    def __init__(self, host: str = METRICS_HOST, port: int = METRICS_PORT, registry: Registry = REGISTRY):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._runner: Optional[web.AppRunner] = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.registry.render(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    async def start(self) -> None:
+        """Запускає сервер у поточному event loop."""
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Метрики доступні на http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
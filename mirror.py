@@ -0,0 +1,233 @@
+"""
+mirror.py — локальне дзеркало тендерів з індексами та повнотекстовим пошуком.
+
+Кожен обхід стрічки записує нормалізовані записи тендерів (назва, замовник,
+регіон, CPV, бюджет, дати) у базу SQLite. Запис оновлюється лише тоді, коли
+прийшла новіша редакція за `dateModified`, тож дзеркало залишається актуальним
+без повторних завантажень. Команда `/tenders` відповідає з дзеркала за
+мілісекунди: пошук за словами з назви (FTS5), мінімальним бюджетом, регіоном,
+CPV-кодами та часовим вікном з пагінацією.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple, Iterable, Optional
+
+from config import MIRROR_DB_FILE, MIRROR_TTL
+from matcher import cpv_prefix, normalize_region
+from records import TenderRecord, to_utc
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MirrorQuery:
+    """
+    Параметри пошуку в дзеркалі. Порожні поля не обмежують вибірку.
+
+    Attributes:
+        keywords (list): слова, які мають бути в назві (з урахуванням префіксів)
+        min_amount (float | None): мінімальний бюджет
+        regions (list): регіони (достатньо збігу з одним)
+        cpv_codes (list): CPV-коди або групи (достатньо збігу з одним)
+        days (int | None): лише тендери, створені за останні N днів
+        page (int): номер сторінки результатів, починаючи з 1
+        page_size (int): кількість тендерів на сторінці
+    """
+    keywords: List[str] = field(default_factory=list)
+    min_amount: Optional[float] = None
+    regions: List[str] = field(default_factory=list)
+    cpv_codes: List[str] = field(default_factory=list)
+    days: Optional[int] = None
+    page: int = 1
+    page_size: int = 5
+
+
+def _fts_query(keywords: List[str]) -> str:
+    """Будує запит FTS5, де кожне слово шукається як префікс."""
+    terms = []
+    for keyword in keywords:
+        keyword = keyword.replace('"', " ").strip()
+        if keyword:
+            terms.append(f'"{keyword}"*')
+    return " ".join(terms)
+
+
+class TenderMirror:
+    """
+    Дзеркало тендерів у SQLite з індексами та FTS5-індексом назв.
+
+    Attributes:
+        path (str): шлях до файлу бази (":memory:" — база в пам'яті)
+        ttl (float | None): записи, не оновлені довше за `ttl` секунд, видаляються
+    """
+
+    PRUNE_INTERVAL = 3600  # секунди між чистками застарілих записів
+
+    COLUMNS = "id, tender_id, title, buyer, region, cpv, amount, currency, date_created, date_modified"
+
+    def __init__(self, path: str = MIRROR_DB_FILE, ttl: Optional[float] = MIRROR_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._last_prune = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tenders (
+                id TEXT PRIMARY KEY,
+                tender_id TEXT,
+                title TEXT,
+                buyer TEXT,
+                region TEXT,
+                region_norm TEXT,
+                cpv TEXT,
+                amount REAL,
+                currency TEXT,
+                date_created TEXT,
+                date_modified TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tenders_created_idx ON tenders (date_created);
+            CREATE INDEX IF NOT EXISTS tenders_amount_idx ON tenders (amount);
+            CREATE INDEX IF NOT EXISTS tenders_cpv_idx ON tenders (cpv);
+            CREATE INDEX IF NOT EXISTS tenders_updated_idx ON tenders (updated_at);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS tenders_fts USING fts5(
+                title, content='tenders', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS tenders_ai AFTER INSERT ON tenders BEGIN
+                INSERT INTO tenders_fts (rowid, title) VALUES (new.rowid, new.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS tenders_ad AFTER DELETE ON tenders BEGIN
+                INSERT INTO tenders_fts (tenders_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS tenders_au AFTER UPDATE OF title ON tenders BEGIN
+                INSERT INTO tenders_fts (tenders_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+                INSERT INTO tenders_fts (rowid, title) VALUES (new.rowid, new.title);
+            END;
+            """
+        )
+        self._backfill_date_created()
+        self._conn.commit()
+
+    def _backfill_date_created(self) -> None:
+        """Заповнює дату створення записів, збережених без неї, датою зміни."""
+        rows = self._conn.execute("SELECT id, date_modified FROM tenders WHERE date_created IS NULL").fetchall()
+        if rows:
+            self._conn.executemany(
+                "UPDATE tenders SET date_created = ? WHERE id = ?",
+                [(to_utc(date_modified), tender_id) for tender_id, date_modified in rows],
+            )
+            logger.info(f"Заповнено дату створення для {len(rows)} тендерів у дзеркалі")
+
+    def upsert(self, records: Iterable[TenderRecord]) -> None:
+        """
+        Записує тендери у дзеркало; існуючі записи оновлюються лише новішою редакцією.
+
+        Дата зміни зберігається в UTC.
+
+        Args:
+            records (iterable): повні записи тендерів
+        """
+        now = time.time()
+        rows = [
+            (
+                record.id, record.tender_id, record.title, record.buyer, record.region,
+                normalize_region(record.region or ""), (record.cpv or "").split("-", 1)[0], record.amount,
+                record.currency, record.date_created, to_utc(record.date_modified), now,
+            )
+            for record in records
+        ]
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO tenders (id, tender_id, title, buyer, region, region_norm, cpv, amount, "
+                "currency, date_created, date_modified, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET "
+                "tender_id = excluded.tender_id, title = excluded.title, buyer = excluded.buyer, "
+                "region = excluded.region, region_norm = excluded.region_norm, cpv = excluded.cpv, "
+                "amount = excluded.amount, currency = excluded.currency, "
+                "date_created = excluded.date_created, date_modified = excluded.date_modified, "
+                "updated_at = excluded.updated_at "
+                # Дати порівнюються як моменти часу: у старих записах збережено київський час
+                # зі зсувом, який змінюється з переходом на літній час
+                "WHERE julianday(excluded.date_modified) > COALESCE(julianday(tenders.date_modified), 0)",
+                rows,
+            )
+        self._prune(now)
+
+    def search(self, query: MirrorQuery) -> Tuple[List[TenderRecord], int]:
+        """
+        Шукає тендери в дзеркалі, новіші першими.
+
+        Args:
+            query (MirrorQuery): параметри пошуку
+
+        Returns:
+            tuple: (записи поточної сторінки, загальна кількість знайдених)
+        """
+        conditions = []
+        params: List = []
+
+        fts = _fts_query(query.keywords)
+        if fts:
+            conditions.append("rowid IN (SELECT rowid FROM tenders_fts WHERE tenders_fts MATCH ?)")
+            params.append(fts)
+
+        if query.min_amount is not None:
+            conditions.append("amount >= ?")
+            params.append(query.min_amount)
+
+        regions = [normalize_region(region) for region in query.regions if normalize_region(region)]
+        if regions:
+            conditions.append("(" + " OR ".join("region_norm LIKE ?" for _ in regions) + ")")
+            params.extend(f"%{region}%" for region in regions)
+
+        prefixes = [cpv_prefix(code) for code in query.cpv_codes]
+        if prefixes:
+            # Діапазон [префікс, префікс + ":") використовує індекс за cpv
+            conditions.append("(" + " OR ".join("(cpv >= ? AND cpv < ?)" for _ in prefixes) + ")")
+            for prefix in prefixes:
+                params.extend((prefix, prefix + ":"))
+
+        if query.days is not None:
+            since = datetime.now(timezone.utc) - timedelta(days=query.days)
+            conditions.append("date_created >= ?")
+            params.append(since.isoformat())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        total = self._conn.execute(f"SELECT COUNT(*) FROM tenders {where}", params).fetchone()[0]
+
+        offset = (max(query.page, 1) - 1) * query.page_size
+        rows = self._conn.execute(
+            f"SELECT {self.COLUMNS} FROM tenders {where} ORDER BY date_created DESC LIMIT ? OFFSET ?",
+            [*params, query.page_size, offset],
+        )
+        return [TenderRecord(*row) for row in rows], total
+
+    def _prune(self, now: float) -> None:
+        """Видаляє записи, що не оновлювались довше за `ttl`."""
+        if self.ttl is None or now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        with self._conn:
+            deleted = self._conn.execute("DELETE FROM tenders WHERE updated_at < ?", (now - self.ttl,)).rowcount
+        if deleted:
+            logger.info(f"Видалено {deleted} застарілих тендерів з дзеркала")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tenders").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
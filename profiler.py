@@ -0,0 +1,106 @@
+"""
+profiler.py — вибірковий профілювальник для одного обходу стрічки.
+
+`SamplingProfiler` у фоновому потоці через рівні проміжки часу знімає стек
+потоку з event loop (`sys._current_frames`) і рахує, скільки разів зустрівся
+кожен стек. Код бота при цьому не інструментується, тож накладні витрати
+малі й не залежать від кількості викликів функцій (на відміну від cProfile).
+
+Результат записується у форматі "folded stacks" (`функція;функція;... N`),
+який відкривають flamegraph.pl, speedscope та інші переглядачі флеймграфів,
+а найгарячіші функції додатково виводяться в лог.
+
+Зверніть увагу: event loop спільний, тому у профіль потрапляють і інші
+корутини (наприклад, надсилання), а очікування мережі видно як час у `select`.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+
+class SamplingProfiler:
+    """
+    Вибірковий профілювальник потоку.
+
+    Attributes:
+        interval (float): проміжок між знімками стека (секунди)
+        samples (Counter): кількість знімків для кожного стека (від кореня до листа)
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self.duration = 0.0
+
+    def start(self) -> None:
+        """Починає знімати стек поточного потоку."""
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Зупиняє збір знімків."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        self.duration = time.perf_counter() - self._started_at
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def hottest(self, limit: int = 10) -> Counter:
+        """
+        Функції, на яких найчастіше зупинявся потік (власний час, без викликаних).
+
+        Returns:
+            Counter: кількість знімків для кожної функції-листа
+        """
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return Counter(dict(leaves.most_common(limit)))
+
+    def write(self, path: str) -> None:
+        """
+        Записує профіль у форматі folded stacks (атомарно).
+
+        Args:
+            path (str): шлях до файлу
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp_path, path)
+
+        total = sum(self.samples.values()) or 1
+        logger.info(f"Профіль обходу ({self.duration:.1f} с, {total} знімків) збережено у {path}")
+        for name, count in self.hottest().items():
+            logger.info(f"  {count / total:6.1%}  {name}")
@@ -0,0 +1,80 @@
+"""
+ratelimit.py — асинхронні обмежувачі частоти запитів.
+
+Містить `TokenBucket` (класичне "відро з токенами") та `HostRateLimiter`,
+що тримає окреме відро для кожного хоста.
+"""
+
+import time
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Відро з токенами: не більше `rate` операцій на секунду з піками до `capacity`.
+
+    Очікування у `acquire` не блокує event loop, а черговість очікувачів
+    зберігається завдяки внутрішньому замку.
+
+    Attributes:
+        rate (float): швидкість поповнення (токенів на секунду)
+        capacity (float): місткість відра (допустимий пік)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Додає токени, накопичені з моменту останнього оновлення."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Чекає, доки у відрі з'явиться потрібна кількість токенів, та забирає їх.
+
+        Args:
+            tokens (float): кількість токенів для однієї операції
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """
+    Набір відер з токенами — по одному на кожен хост.
+
+    Attributes:
+        rate (float): запитів на секунду до одного хоста
+        capacity (float | None): допустимий пік запитів
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> None:
+        """
+        Чекає дозволу на запит до хоста з адреси `url`.
+
+        Args:
+            url (str): адреса запиту
+        """
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+        await bucket.acquire()
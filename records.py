@@ -0,0 +1,132 @@
+"""
+records.py — компактні записи тендерів.
+
+Відповіді API містять великі вкладені словники, з яких боту потрібні лише
+кілька полів. Кожен тендер одразу після розбору проєктується у `TenderRecord`
+зі `__slots__`, а повний словник відкидається. Текст повідомлення для Telegram
+формується лише тоді, коли його справді потрібно надіслати чи показати.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from telegram.helpers import escape_markdown
+
+
+def to_utc(value: Optional[str]) -> Optional[str]:
+    """
+    Переводить дату ISO 8601 з API у UTC, щоб рядки можна було порівнювати.
+
+    Args:
+        value (str | None): дата з API
+
+    Returns:
+        str | None: дата в UTC або початкове значення, якщо його не вдалося розібрати
+    """
+    if not value:
+        return value
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat()
+
+
+class TenderRecord:
+    """
+    Компактний запис тендера з полями, які використовують фільтри, дзеркало та повідомлення.
+
+    Поле зі значенням None означає, що API його не повернув (наприклад,
+    у мінімальному записі стрічки).
+    """
+
+    __slots__ = (
+        "id", "tender_id", "title", "buyer", "region", "cpv",
+        "amount", "currency", "date_created", "date_modified",
+    )
+
+    # Поля, без яких тендер неможливо відфільтрувати чи показати користувачу
+    REQUIRED_FIELDS = ("title", "tender_id", "region", "cpv", "amount")
+
+    def __init__(
+        self,
+        id: str,
+        tender_id: Optional[str] = None,
+        title: Optional[str] = None,
+        buyer: Optional[str] = None,
+        region: Optional[str] = None,
+        cpv: Optional[str] = None,
+        amount: Optional[float] = None,
+        currency: Optional[str] = None,
+        date_created: Optional[str] = None,
+        date_modified: str = "",
+    ):
+        self.id = id
+        self.tender_id = tender_id
+        self.title = title
+        self.buyer = buyer
+        self.region = region
+        self.cpv = cpv
+        self.amount = amount
+        self.currency = currency
+        self.date_created = date_created
+        self.date_modified = date_modified
+
+    @classmethod
+    def from_api(cls, tender: Dict) -> "TenderRecord":
+        """
+        Проєктує запис тендера з API у компактний запис.
+
+        Args:
+            tender (dict): запис зі стрічки або повний запис тендера
+
+        Returns:
+            TenderRecord: компактний запис
+        """
+        procuring_entity = tender.get("procuringEntity") or {}
+        address = procuring_entity.get("address") or {}
+        classification = tender.get("classification") or {}
+        value = tender.get("value") or {}
+        return cls(
+            id=tender["id"],
+            tender_id=tender.get("tenderID"),
+            title=tender.get("title"),
+            buyer=procuring_entity.get("name"),
+            region=address.get("region"),
+            cpv=classification.get("id"),
+            amount=value.get("amount"),
+            currency=value.get("currency"),
+            # Без дати створення (наприклад, у стрічці) найближча оцінка — дата зміни
+            date_created=to_utc(tender.get("dateCreated") or tender.get("date") or tender.get("dateModified")),
+            date_modified=tender.get("dateModified", ""),
+        )
+
+    @property
+    def needs_details(self) -> bool:
+        """bool: True, якщо бракує полів, потрібних фільтрам, і тендер треба дозавантажити."""
+        return any(getattr(self, name) is None for name in self.REQUIRED_FIELDS)
+
+    def render(self) -> str:
+        """
+        Готує текстове повідомлення про тендер для Telegram.
+
+        Поля з API екрануються: непарний `_`, `*`, `` ` `` чи `[` у назві
+        інакше робить Markdown недійсним, і Telegram відхиляє повідомлення.
+
+        Returns:
+            str: повідомлення у форматі Markdown
+        """
+        amount = self.amount if self.amount is not None else "Невідомо"
+        return (
+            f"📌 *{escape_markdown(self.title or 'Без назви')}*\n"
+            f"🏢 Замовник: {escape_markdown(self.buyer or 'Невідомо')}\n"
+            f"📍 Регіон: {escape_markdown(self.region or '')}\n"
+            f"🆔 ID: {escape_markdown(str(self.tender_id))}\n"
+            f"💰 Бюджет: {amount} {escape_markdown(self.currency or '')}\n"
+            f"🔗 [Деталі](https://prozorro.gov.ua/tender/{self.id})"
+        )
+
+    def __repr__(self) -> str:
+        return f"TenderRecord(id={self.id!r}, tender_id={self.tender_id!r}, date_modified={self.date_modified!r})"
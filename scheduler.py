@@ -0,0 +1,92 @@
+"""
+scheduler.py — адаптивний розклад перевірок стрічки ProZorro.
+
+Інтервал між обходами залежить від:
+- часу доби: у робочі години стрічка активніша, тож перевірки частіші
+- активності: чим більше нових тендерів знаходили останні обходи, тим коротший інтервал
+- незавершеного обходу: якщо обхід зупинився на MAX_PAGES, наступний стартує одразу
+- помилок: після невдачі інтервал росте експоненційно, з урахуванням Retry-After
+
+Наступний обхід планується лише після завершення попереднього, тож два
+обходи ніколи не виконуються одночасно.
+"""
+
+import random
+import logging
+from datetime import datetime
+from typing import Optional
+
+import pytz
+
+from config import (
+    POLL_INTERVAL_BUSY, POLL_INTERVAL_IDLE, POLL_INTERVAL_MIN, POLL_INTERVAL_MAX,
+    BUSINESS_HOURS, BUSINESS_DAYS, POLL_TIMEZONE, ACTIVITY_SCALE, ACTIVITY_SMOOTHING,
+    ERROR_BACKOFF_MAX
+)
+from tender_api import SweepStats, RateLimitedError
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveScheduler:
+    """
+    Обчислює паузу до наступного обходу за результатами попереднього.
+
+    Attributes:
+        activity (float): згладжена (EMA) кількість нових тендерів за обхід
+        failures (int): кількість невдалих обходів поспіль
+    """
+
+    def __init__(self):
+        self.activity = 0.0
+        self.failures = 0
+        self._timezone = pytz.timezone(POLL_TIMEZONE)
+
+    def base_interval(self, now: Optional[datetime] = None) -> float:
+        """
+        Базовий інтервал залежно від часу доби та дня тижня.
+
+        Args:
+            now (datetime | None): поточний час (за замовчуванням — зараз)
+
+        Returns:
+            float: інтервал у секундах
+        """
+        local = (now or datetime.now(pytz.utc)).astimezone(self._timezone)
+        start, end = BUSINESS_HOURS
+        if local.weekday() in BUSINESS_DAYS and start <= local.hour < end:
+            return POLL_INTERVAL_BUSY
+        return POLL_INTERVAL_IDLE
+
+    def next_delay(self, stats: SweepStats, now: Optional[datetime] = None) -> float:
+        """
+        Оновлює стан планувальника та повертає паузу до наступного обходу.
+
+        Args:
+            stats (SweepStats): підсумок щойно завершеного обходу
+            now (datetime | None): поточний час (за замовчуванням — зараз)
+
+        Returns:
+            float: пауза в секундах
+        """
+        if stats.error is not None:
+            self.failures += 1
+            delay = min(ERROR_BACKOFF_MAX, POLL_INTERVAL_MIN * 2 ** self.failures)
+            if isinstance(stats.error, RateLimitedError) and stats.error.retry_after:
+                delay = max(delay, stats.error.retry_after)
+            # Невеликий розкид, щоб повтори не збігались з іншими клієнтами API
+            delay *= random.uniform(0.9, 1.1)
+            logger.warning(f"Обхід завершився помилкою ({self.failures} поспіль), наступний через {delay:.0f} с")
+            return delay
+
+        self.failures = 0
+        self.activity += ACTIVITY_SMOOTHING * (stats.new_tenders - self.activity)
+
+        if not stats.complete:
+            # Стрічка ще не вичерпана — продовжуємо, щойно дозволяє мінімальний інтервал
+            return POLL_INTERVAL_MIN
+
+        delay = self.base_interval(now) / (1 + self.activity / ACTIVITY_SCALE)
+        delay = max(POLL_INTERVAL_MIN, min(POLL_INTERVAL_MAX, delay))
+        logger.info(f"Активність стрічки {self.activity:.1f} тендерів/обхід, наступний обхід через {delay:.0f} с")
+        return delay
@@ -0,0 +1,212 @@
+"""
+seen_store.py — сховища вже оброблених тендерів.
+
+Модуль надає підключувані бекенди для дедуплікації тендерів:
+- `SQLiteSeenStore` — вбудована база SQLite у змонтованому каталозі даних,
+  переживає перезапуски контейнера
+- `MemorySeenStore` — компактне сховище в пам'яті з витісненням за розміром та віком
+
+Обидва бекенди зберігають `dateModified` кожного тендера, тож тендер, який
+справді змінився, знову вважається новим, а незмінені залишаються "тихими".
+"""
+
+import os
+import time
+import sqlite3
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Set, Optional
+
+from config import SEEN_BACKEND, SEEN_DB_FILE, SEEN_MAX_SIZE, SEEN_TTL
+
+logger = logging.getLogger(__name__)
+
+# Обмеження SQLite на кількість параметрів в одному запиті
+SQLITE_BATCH_SIZE = 500
+
+
+class SeenStore(ABC):
+    """
+    Базовий інтерфейс сховища оброблених тендерів.
+
+    Усі методи працюють пакетами: `items` — словник `{tender_id: dateModified}`
+    для цілої сторінки стрічки.
+    """
+
+    @abstractmethod
+    def filter_new(self, items: Dict[str, str]) -> Set[str]:
+        """
+        Повертає ID тендерів, яких ще немає у сховищі або які змінилися.
+
+        Args:
+            items (dict): відображення ID тендера на його dateModified
+
+        Returns:
+            set: ID нових або змінених тендерів
+        """
+
+    @abstractmethod
+    def mark(self, items: Dict[str, str]) -> None:
+        """
+        Запам'ятовує тендери як оброблені.
+
+        Args:
+            items (dict): відображення ID тендера на його dateModified
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Кількість записів у сховищі."""
+
+    def close(self) -> None:
+        """Звільняє ресурси сховища."""
+
+
+class MemorySeenStore(SeenStore):
+    """
+    Сховище в пам'яті з LRU-витісненням.
+
+    Записи старші за `ttl` секунд та найдавніші записи понад `max_size`
+    видаляються при кожному `mark`, тож обсяг пам'яті не зростає з часом.
+
+    Attributes:
+        max_size (int): максимальна кількість записів
+        ttl (float | None): час життя запису в секундах (None — без обмеження)
+    """
+
+    def __init__(self, max_size: int = SEEN_MAX_SIZE, ttl: Optional[float] = SEEN_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        # tender_id -> (dateModified, час останнього оновлення)
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def filter_new(self, items: Dict[str, str]) -> Set[str]:
+        new_ids = set()
+        for tender_id, date_modified in items.items():
+            entry = self._items.get(tender_id)
+            if entry is None or entry[0] != date_modified:
+                new_ids.add(tender_id)
+        return new_ids
+
+    def mark(self, items: Dict[str, str]) -> None:
+        now = time.time()
+        for tender_id, date_modified in items.items():
+            self._items[tender_id] = (date_modified, now)
+            self._items.move_to_end(tender_id)
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Видаляє прострочені записи та записи понад ліміт розміру."""
+        if self.ttl is not None:
+            deadline = now - self.ttl
+            while self._items:
+                oldest_id, (_, updated_at) = next(iter(self._items.items()))
+                if updated_at >= deadline:
+                    break
+                del self._items[oldest_id]
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SQLiteSeenStore(SeenStore):
+    """
+    Сховище на базі SQLite.
+
+    Записи старші за `ttl` секунд періодично видаляються. Це безпечно, бо стрічка
+    змін повертає тендер повторно лише тоді, коли він змінився.
+
+    Attributes:
+        path (str): шлях до файлу бази
+        ttl (float | None): час життя запису в секундах (None — без обмеження)
+    """
+
+    PRUNE_INTERVAL = 3600  # секунди між чистками застарілих записів
+
+    def __init__(self, path: str = SEEN_DB_FILE, ttl: Optional[float] = SEEN_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._last_prune = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " tender_id TEXT PRIMARY KEY,"
+            " date_modified TEXT,"
+            " seen_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_at_idx ON seen (seen_at)")
+        self._conn.commit()
+
+    def filter_new(self, items: Dict[str, str]) -> Set[str]:
+        known = {}
+        ids = list(items)
+        for start in range(0, len(ids), SQLITE_BATCH_SIZE):
+            batch = ids[start:start + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT tender_id, date_modified FROM seen WHERE tender_id IN ({placeholders})",
+                batch,
+            )
+            known.update(rows)
+
+        return {
+            tender_id for tender_id, date_modified in items.items()
+            if tender_id not in known or known[tender_id] != date_modified
+        }
+
+    def mark(self, items: Dict[str, str]) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO seen (tender_id, date_modified, seen_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(tender_id) DO UPDATE SET "
+                "date_modified = excluded.date_modified, seen_at = excluded.seen_at",
+                [(tender_id, date_modified, now) for tender_id, date_modified in items.items()],
+            )
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Видаляє записи, старші за `ttl`, не частіше ніж раз на PRUNE_INTERVAL."""
+        if self.ttl is None or now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        with self._conn:
+            deleted = self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (now - self.ttl,)).rowcount
+        if deleted:
+            logger.info(f"Видалено {deleted} застарілих записів зі сховища оброблених тендерів")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def create_seen_store(backend: str = SEEN_BACKEND) -> SeenStore:
+    """
+    Створює сховище оброблених тендерів за назвою бекенда.
+
+    Args:
+        backend (str): "sqlite" або "memory"
+
+    Returns:
+        SeenStore: екземпляр сховища
+
+    Raises:
+        ValueError: якщо бекенд невідомий
+    """
+    if backend == "sqlite":
+        return SQLiteSeenStore()
+    if backend == "memory":
+        return MemorySeenStore()
+    raise ValueError(f"⚠️ Невідомий бекенд сховища оброблених тендерів: {backend}")
@@ -0,0 +1,348 @@
+"""
+subscriptions.py — постійне сховище підписок чатів та стану доставки.
+
+Кожен чат має одну підписку з власними CPV-кодами та регіонами. Для кожного
+чату окремо запам'ятовується, які тендери (і в якій редакції dateModified)
+вже надіслано, тож один спільний обхід стрічки можна розсилати будь-якій
+кількості підписників без дублікатів.
+
+Повідомлення, що очікують надсилання, зберігаються у таблиці `outbox`
+і видаляються з неї лише після успішної доставки (див. `delivery.py`).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import List, Dict, Set, Iterable, NamedTuple, Optional
+
+from config import SUBSCRIPTIONS_DB_FILE, SEEN_TTL
+from matcher import Subscription, default_subscription
+from seen_store import SQLITE_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxItem(NamedTuple):
+    """Повідомлення про тендер, що очікує надсилання у чат."""
+    tender_id: str
+    date_modified: str
+    text: str
+
+
+class SubscriptionStore:
+    """
+    Сховище підписок та журналу доставки на базі SQLite.
+
+    ID підписки збігається з ID чату (у вигляді рядка).
+
+    Attributes:
+        path (str): шлях до файлу бази
+        ttl (float | None): час життя записів журналу доставки (секунди)
+    """
+
+    PRUNE_INTERVAL = 3600  # секунди між чистками журналу доставки
+
+    def __init__(self, path: str = SUBSCRIPTIONS_DB_FILE, ttl: Optional[float] = SEEN_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._last_prune = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS subscriptions ("
+            " chat_id INTEGER PRIMARY KEY,"
+            " cpv_codes TEXT NOT NULL,"
+            " regions TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS deliveries ("
+            " chat_id INTEGER NOT NULL,"
+            " tender_id TEXT NOT NULL,"
+            " date_modified TEXT,"
+            " delivered_at REAL NOT NULL,"
+            " PRIMARY KEY (chat_id, tender_id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS delivered_at_idx ON deliveries (delivered_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " chat_id INTEGER NOT NULL,"
+            " tender_id TEXT NOT NULL,"
+            " date_modified TEXT,"
+            " text TEXT NOT NULL,"
+            " UNIQUE (chat_id, tender_id))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_subscription(row) -> Subscription:
+        chat_id, cpv_codes, regions = row
+        return Subscription(id=str(chat_id), cpv_codes=json.loads(cpv_codes), regions=json.loads(regions))
+
+    def get(self, chat_id: int) -> Optional[Subscription]:
+        """
+        Повертає підписку чату.
+
+        Args:
+            chat_id (int): ID чату Telegram
+
+        Returns:
+            Subscription | None: підписка або None, якщо чат не підписаний
+        """
+        row = self._conn.execute(
+            "SELECT chat_id, cpv_codes, regions FROM subscriptions WHERE chat_id = ?", (chat_id,)
+        ).fetchone()
+        return self._to_subscription(row) if row else None
+
+    def all(self) -> List[Subscription]:
+        """
+        Returns:
+            List[Subscription]: усі активні підписки
+        """
+        rows = self._conn.execute("SELECT chat_id, cpv_codes, regions FROM subscriptions")
+        return [self._to_subscription(row) for row in rows]
+
+    def subscribe(self, chat_id: int) -> Subscription:
+        """
+        Підписує чат з фільтрами за замовчуванням (якщо він ще не підписаний).
+
+        Args:
+            chat_id (int): ID чату Telegram
+
+        Returns:
+            Subscription: підписка чату
+        """
+        existing = self.get(chat_id)
+        if existing:
+            return existing
+
+        defaults = default_subscription()
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO subscriptions (chat_id, cpv_codes, regions, created_at) VALUES (?, ?, ?, ?)",
+                (chat_id, json.dumps(defaults.cpv_codes), json.dumps(defaults.regions, ensure_ascii=False), time.time()),
+            )
+        logger.info(f"Чат {chat_id} підписано на сповіщення")
+        return self.get(chat_id)
+
+    def bootstrap(self, chat_id: int) -> bool:
+        """
+        Одноразово підписує початковий чат (CHAT_ID з .env) у новій базі.
+
+        Після першого виклику у базі лишається позначка, тож чат, який потім
+        відписався, не підписується знову при перезапуску. У базі, що вже має
+        підписки чи журнал доставки, чат не підписується.
+
+        Args:
+            chat_id (int): ID чату Telegram
+
+        Returns:
+            bool: True, якщо чат було підписано
+        """
+        if self._conn.execute("SELECT 1 FROM meta WHERE key = 'bootstrapped'").fetchone():
+            return False
+
+        is_new = not self._conn.execute(
+            "SELECT 1 FROM subscriptions UNION ALL SELECT 1 FROM deliveries LIMIT 1"
+        ).fetchone()
+        if is_new:
+            self.subscribe(chat_id)
+        with self._conn:
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('bootstrapped', ?)", (str(chat_id),))
+        return is_new
+
+    def update(self, chat_id: int, cpv_codes: Optional[List[str]] = None, regions: Optional[List[str]] = None) -> Optional[Subscription]:
+        """
+        Змінює фільтри підписки чату.
+
+        Args:
+            chat_id (int): ID чату Telegram
+            cpv_codes (list | None): нові CPV-коди (None — без змін)
+            regions (list | None): нові регіони (None — без змін)
+
+        Returns:
+            Subscription | None: оновлена підписка або None, якщо чат не підписаний
+        """
+        with self._conn:
+            if cpv_codes is not None:
+                self._conn.execute(
+                    "UPDATE subscriptions SET cpv_codes = ? WHERE chat_id = ?", (json.dumps(cpv_codes), chat_id)
+                )
+            if regions is not None:
+                self._conn.execute(
+                    "UPDATE subscriptions SET regions = ? WHERE chat_id = ?",
+                    (json.dumps(regions, ensure_ascii=False), chat_id),
+                )
+        return self.get(chat_id)
+
+    def unsubscribe(self, chat_id: int) -> bool:
+        """
+        Видаляє підписку чату разом з його журналом доставки.
+
+        Args:
+            chat_id (int): ID чату Telegram
+
+        Returns:
+            bool: True, якщо підписка існувала
+        """
+        with self._conn:
+            deleted = self._conn.execute("DELETE FROM subscriptions WHERE chat_id = ?", (chat_id,)).rowcount
+            self._conn.execute("DELETE FROM deliveries WHERE chat_id = ?", (chat_id,))
+            self._conn.execute("DELETE FROM outbox WHERE chat_id = ?", (chat_id,))
+        if deleted:
+            logger.info(f"Чат {chat_id} відписано від сповіщень")
+        return bool(deleted)
+
+    def filter_undelivered(self, chat_id: int, items: Dict[str, str]) -> Set[str]:
+        """
+        Повертає тендери, які ще не надсилались у чат (або змінились після надсилання).
+
+        Args:
+            chat_id (int): ID чату Telegram
+            items (dict): відображення ID тендера на його dateModified
+
+        Returns:
+            set: ID тендерів для надсилання
+        """
+        delivered = {}
+        ids = list(items)
+        for start in range(0, len(ids), SQLITE_BATCH_SIZE):
+            batch = ids[start:start + SQLITE_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT tender_id, date_modified FROM deliveries "
+                f"WHERE chat_id = ? AND tender_id IN ({placeholders})",
+                [chat_id, *batch],
+            )
+            delivered.update(rows)
+
+        return {
+            tender_id for tender_id, date_modified in items.items()
+            if delivered.get(tender_id) != date_modified
+        }
+
+    def mark_delivered(self, chat_id: int, items: Dict[str, str]) -> None:
+        """
+        Записує тендери як надіслані у чат.
+
+        Args:
+            chat_id (int): ID чату Telegram
+            items (dict): відображення ID тендера на його dateModified
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO deliveries (chat_id, tender_id, date_modified, delivered_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(chat_id, tender_id) DO UPDATE SET "
+                "date_modified = excluded.date_modified, delivered_at = excluded.delivered_at",
+                [(chat_id, tender_id, date_modified, now) for tender_id, date_modified in items.items()],
+            )
+        self._prune(now)
+
+    def enqueue(self, chat_id: int, items: Iterable[OutboxItem]) -> int:
+        """
+        Додає у чергу надсилання тендери, яких чат ще не отримував.
+
+        Тендер, що вже стоїть у черзі, замінюється новішою редакцією.
+
+        Args:
+            chat_id (int): ID чату Telegram
+            items (iterable): повідомлення про тендери
+
+        Returns:
+            int: кількість тендерів, доданих до черги
+        """
+        items = {item.tender_id: item for item in items}
+        pending = self.filter_undelivered(chat_id, {tender_id: item.date_modified for tender_id, item in items.items()})
+        if not pending:
+            return 0
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO outbox (chat_id, tender_id, date_modified, text) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(chat_id, tender_id) DO UPDATE SET "
+                "date_modified = excluded.date_modified, text = excluded.text",
+                [(chat_id, tender_id, items[tender_id].date_modified, items[tender_id].text) for tender_id in pending],
+            )
+        return len(pending)
+
+    def pending(self, chat_id: int, limit: int) -> List[OutboxItem]:
+        """
+        Повертає найстаріші повідомлення з черги чату.
+
+        Args:
+            chat_id (int): ID чату Telegram
+            limit (int): максимальна кількість повідомлень
+
+        Returns:
+            List[OutboxItem]: повідомлення у порядку додавання
+        """
+        rows = self._conn.execute(
+            "SELECT tender_id, date_modified, text FROM outbox WHERE chat_id = ? ORDER BY id LIMIT ?",
+            (chat_id, limit),
+        )
+        return [OutboxItem(*row) for row in rows]
+
+    def pending_chats(self) -> List[int]:
+        """
+        Returns:
+            List[int]: ID чатів, для яких є неотримані повідомлення
+        """
+        return [row[0] for row in self._conn.execute("SELECT DISTINCT chat_id FROM outbox")]
+
+    def outbox_size(self) -> int:
+        """
+        Returns:
+            int: загальна кількість повідомлень у черзі
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def complete(self, chat_id: int, items: Iterable[OutboxItem]) -> None:
+        """
+        Прибирає надіслані повідомлення з черги та записує їх у журнал доставки.
+
+        Args:
+            chat_id (int): ID чату Telegram
+            items (iterable): надіслані повідомлення
+        """
+        items = list(items)
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM outbox WHERE chat_id = ? AND tender_id = ? AND date_modified IS ?",
+                [(chat_id, item.tender_id, item.date_modified) for item in items],
+            )
+        self.mark_delivered(chat_id, {item.tender_id: item.date_modified for item in items})
+
+    def discard(self, chat_id: int, items: Iterable[OutboxItem]) -> None:
+        """
+        Видаляє з черги повідомлення, які неможливо доставити.
+
+        Args:
+            chat_id (int): ID чату Telegram
+            items (iterable): повідомлення для видалення
+        """
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM outbox WHERE chat_id = ? AND tender_id = ?",
+                [(chat_id, item.tender_id) for item in items],
+            )
+
+    def _prune(self, now: float) -> None:
+        """Видаляє записи журналу доставки, старші за `ttl`."""
+        if self.ttl is None or now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        with self._conn:
+            self._conn.execute("DELETE FROM deliveries WHERE delivered_at < ?", (now - self.ttl,))
+
+    def close(self) -> None:
+        self._conn.close()
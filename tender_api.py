@@ -2,141 +2,428 @@
 tender_api.py — модуль для роботи з ProZorro API.
 
 Цей файл містить клас `ProZorroAPI`, який відповідає за:
-- Виконання HTTP-запитів до API ProZorro
-- Фільтрацію тендерів за CPV кодами та регіонами
-- Підготовку текстових повідомлень для Telegram бота
+- Виконання асинхронних HTTP-запитів до API ProZorro через пул keep-alive з'єднань
+- Дозавантаження полів, потрібних фільтрам (див. `enrichment.py`)
+- Фільтрацію тендерів за CPV кодами та регіонами (див. `matcher.py`)
+- Потоковий розбір сторінок у компактні записи (див. `json_stream.py`, `records.py`)
 - Підтримку пагінації та унікальності результатів
+- Інкрементальний обхід стрічки змін зі збереженим курсором (див. `feed_cursor.py`)
+- Оновлення локального дзеркала тендерів для пошуку (див. `mirror.py`)
+- Запис метрик кожного етапу обходу (див. `metrics.py`)
 """
 
 import time
+import codecs
+import itertools
+import asyncio
 import logging
-import requests
-from typing import List, Dict
+from dataclasses import dataclass
+from typing import List, Dict, Set, Tuple, Iterable, AsyncIterator, Optional
+
+import aiohttp
 
 from config import (
-    BASE_URL, CPV_CODES, ALLOWED_REGIONS, ALLOWED_REGION_KEYWORDS,
-    SESSION_HEADERS, PAGE_LIMIT, MAX_PAGES, REQUEST_TIMEOUT, REQUEST_DELAY
+    BASE_URL, SESSION_HEADERS, PAGE_LIMIT, MAX_PAGES, REQUEST_TIMEOUT, REQUEST_DELAY,
+    HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT,
+    COLD_START_MODE, LISTING_OPT_FIELDS, STREAM_CHUNK_SIZE, ENRICH_RETRY_SWEEPS
 )
+from feed_cursor import FeedCursor, COLD_START_CATCHUP, COLD_START_MODES
+from seen_store import SeenStore, create_seen_store
+from enrichment import TenderEnricher
+from matcher import Subscription, SubscriptionMatcher, default_subscription
+from mirror import TenderMirror
+from records import TenderRecord, to_utc
+from json_stream import ListingParser
+from metrics import STAGE_SECONDS, SWEEP_SECONDS, SWEEPS, PAGES, TENDERS
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimitedError(aiohttp.ClientError):
+    """
+    API відповів 429 Too Many Requests.
+
+    Attributes:
+        retry_after (float | None): рекомендована пауза з заголовка Retry-After (секунди)
+    """
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(f"ProZorro API обмежив частоту запитів (Retry-After: {retry_after})")
+        self.retry_after = retry_after
+
+
+@dataclass
+class SweepStats:
+    """
+    Підсумок одного обходу стрічки (використовується планувальником).
+
+    Attributes:
+        pages (int): кількість завантажених сторінок
+        new_tenders (int): кількість нових або змінених тендерів
+        matches (int): кількість тендерів, що відповідають хоча б одній підписці
+        complete (bool): True, якщо обхід дійшов до кінця стрічки (а не до MAX_PAGES)
+        error (Exception | None): помилка, що перервала обхід
+    """
+    pages: int = 0
+    new_tenders: int = 0
+    matches: int = 0
+    complete: bool = False
+    error: Optional[Exception] = None
+
+
+@dataclass(slots=True)
+class TenderMatch:
+    """
+    Тендер, що відповідає хоча б одній підписці.
+
+    Attributes:
+        record (TenderRecord): компактний запис тендера
+        subscriptions (set): ID підписок, яким відповідає тендер
+    """
+    record: TenderRecord
+    subscriptions: Set[str]
+
+
 class ProZorroAPI:
     """
     Клас для роботи з ProZorro API.
 
+    Сесія створюється ліниво всередині event loop, тому екземпляр можна
+    створювати на рівні модуля. Після завершення роботи потрібно викликати `close()`.
+
     Attributes:
-        session (requests.Session): HTTP-сесія для повторного використання з'єднання
-        seen_tenders (set): множина для збереження ID вже оброблених тендерів
+        session (aiohttp.ClientSession | None): HTTP-сесія з пулом keep-alive з'єднань
+        seen (SeenStore): сховище вже оброблених тендерів (ID та dateModified)
+        cursor (FeedCursor): збережена позиція у стрічці змін
+        cold_start (str): режим старту без курсора ("catchup" або "latest")
+        enricher (TenderEnricher): пул дозавантаження повних даних тендерів
+        matcher (SubscriptionMatcher): скомпільовані фільтри за CPV-кодами та регіонами
+        mirror (TenderMirror): локальне дзеркало всіх оброблених тендерів
+        request_delay (float): пауза між сторінками стрічки (секунди)
+        last_sweep (SweepStats): підсумок останнього обходу
     """
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(SESSION_HEADERS)
-        self.seen_tenders = set()
-
-    def _is_region_allowed(self, address: str) -> bool:
+    # Скільки адрес сторінок пам'ятати для умовних запитів (ETag / Last-Modified)
+    VALIDATORS_LIMIT = 16
+
+    def __init__(
+        self,
+        cursor: Optional[FeedCursor] = None,
+        cold_start: str = COLD_START_MODE,
+        seen: Optional[SeenStore] = None,
+        enricher: Optional[TenderEnricher] = None,
+        matcher: Optional[SubscriptionMatcher] = None,
+        mirror: Optional[TenderMirror] = None,
+        request_delay: float = REQUEST_DELAY,
+    ):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.seen = seen if seen is not None else create_seen_store()
+        self.enricher = enricher if enricher is not None else TenderEnricher()
+        self.matcher = matcher if matcher is not None else SubscriptionMatcher([default_subscription()])
+        self.mirror = mirror if mirror is not None else TenderMirror()
+        self.cursor = cursor if cursor is not None else FeedCursor()
+        if cold_start not in COLD_START_MODES:
+            raise ValueError(f"⚠️ Невідомий режим холодного старту: {cold_start} (очікується {' або '.join(COLD_START_MODES)})")
+        self.cold_start = cold_start
+        self.request_delay = request_delay
+        self.last_sweep = SweepStats()
+        self._validators: Dict[str, Dict[str, str]] = {}
+
+    def set_subscriptions(self, subscriptions: Iterable[Subscription]) -> None:
         """
-        Перевіряє, чи адреса замовника належить до дозволених регіонів.
+        Перекомпілює фільтри після зміни набору підписок.
 
         Args:
-            address (str): рядок з адресою замовника
-
-        Returns:
-            bool: True, якщо адреса відповідає фільтру; False — інакше
+            subscriptions (iterable): актуальні підписки
         """
-        if not address:
-            return False
-        return any(region in address for region in ALLOWED_REGIONS) or \
-               any(keyword in address for keyword in ALLOWED_REGION_KEYWORDS)
+        self.matcher = SubscriptionMatcher(subscriptions)
 
-    def _is_cpv_allowed(self, cpv_code: str) -> bool:
+    async def _get_session(self) -> aiohttp.ClientSession:
         """
-        Перевіряє, чи CPV-код належить до дозволених.
-
-        Args:
-            cpv_code (str): CPV-код (класифікатор)
+        Повертає спільну HTTP-сесію, створюючи її за потреби.
 
         Returns:
-            bool: True, якщо код відповідає фільтру; False — інакше
+            aiohttp.ClientSession: сесія з обмеженим пулом з'єднань
         """
-        return any(cpv_code.startswith(code[:4]) for code in CPV_CODES)
-
-    def _fetch_page(self, offset: str = "") -> Dict:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=SESSION_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Закриває HTTP-сесію та звільняє з'єднання пулу."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.seen.close()
+        self.mirror.close()
+
+    async def _fetch_page(self, offset: str = "") -> Tuple[List[TenderRecord], Optional[str]]:
         """
         Виконує HTTP-запит на отримання сторінки тендерів з API.
 
+        Тіло відповіді розбирається потоково: кожен тендер проєктується у
+        `TenderRecord`, щойно він прочитаний, тож повна відповідь не тримається
+        в пам'яті. Час розбору записується в метрику етапу `parse`, решта часу
+        запиту — в етап `fetch`. Якщо сервер раніше повернув ETag або Last-Modified для цієї
+        сторінки, запит стає умовним; відповідь 304 означає, що змін немає.
+
         Args:
             offset (str): курсор пагінації (по замовчуванню — порожній)
 
         Returns:
-            dict: JSON-відповідь від API
+            tuple: (записи тендерів сторінки, курсор наступної сторінки);
+                для 304 — порожня сторінка з тим самим курсором
 
         Raises:
-            requests.RequestException: у випадку проблем з мережею
+            RateLimitedError: якщо API відповів 429
+            aiohttp.ClientError: у випадку проблем з мережею
+            asyncio.TimeoutError: якщо API не відповів за REQUEST_TIMEOUT
         """
-        url = f"{BASE_URL}?limit={PAGE_LIMIT}&offset={offset}"
+        opt_fields = ",".join(LISTING_OPT_FIELDS)
+        url = f"{BASE_URL}?limit={PAGE_LIMIT}&offset={offset}&opt_fields={opt_fields}"
         logger.debug(f"Запит до API: {url}")
 
-        response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        return response.json()
+        headers = {}
+        validators = self._validators.get(url, {})
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
 
-    def search_tenders(self) -> List[str]:
+        started = time.perf_counter()
+        parse_seconds: Optional[float] = None
+        try:
+            session = await self._get_session()
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    logger.debug(f"Сторінка не змінилась: {url}")
+                    PAGES.inc(result="not_modified")
+                    return [], offset
+
+                if response.status == 429:
+                    retry_after = response.headers.get("Retry-After", "")
+                    raise RateLimitedError(float(retry_after) if retry_after.isdigit() else None)
+
+                response.raise_for_status()
+
+                records = []
+                parser = ListingParser()
+                decoder = codecs.getincrementaldecoder("utf-8")()
+                parse_seconds = 0.0
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    parse_started = time.perf_counter()
+                    items = parser.feed(decoder.decode(chunk))
+                    records.extend(TenderRecord.from_api(item) for item in items if item.get("id"))
+                    parse_seconds += time.perf_counter() - parse_started
+                parse_started = time.perf_counter()
+                items = parser.feed(decoder.decode(b"", final=True), final=True)
+                records.extend(TenderRecord.from_api(item) for item in items if item.get("id"))
+                parse_seconds += time.perf_counter() - parse_started
+
+                self._remember_validators(url, response.headers)
+                PAGES.inc(result="ok")
+                return records, parser.meta.get("next_page", {}).get("offset")
+
+        except RateLimitedError:
+            PAGES.inc(result="throttled")
+            raise
+        except Exception:
+            PAGES.inc(result="error")
+            raise
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - started - (parse_seconds or 0.0), stage="fetch")
+            if parse_seconds is not None:
+                STAGE_SECONDS.observe(parse_seconds, stage="parse")
+
+    def _remember_validators(self, url: str, headers) -> None:
+        """Зберігає ETag / Last-Modified сторінки для наступного умовного запиту."""
+        validators = {name: headers[name] for name in ("ETag", "Last-Modified") if name in headers}
+        if not validators:
+            return
+        if len(self._validators) >= self.VALIDATORS_LIMIT:
+            self._validators.pop(next(iter(self._validators)))
+        self._validators[url] = validators
+
+    async def _fetch_latest_offset(self) -> str:
         """
-        Пошук актуальних тендерів за заданими фільтрами.
+        Визначає курсор, що вказує на поточний кінець стрічки змін.
+
+        Запитує один найновіший тендер у зворотному порядку: його `prev_page.offset`
+        продовжує звичайну (висхідну) стрічку одразу після нього.
 
         Returns:
-            List[str]: список текстових повідомлень про тендери
+            str: курсор для старту з поточного моменту
         """
-        results = []
-        offset = ""
-        pages = 0
+        url = f"{BASE_URL}?limit=1&descending=1"
+        session = await self._get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await response.json()
 
-        try:
-            while pages < MAX_PAGES:
-                data = self._fetch_page(offset)
-                tenders = data.get("data", [])
-                offset = data.get("next_page", {}).get("offset")
-                pages += 1
+        offset = data.get("prev_page", {}).get("offset")
+        return offset or str(time.time())
+
+    async def _start_offset(self) -> str:
+        """
+        Повертає курсор, з якого починається обхід.
+
+        Returns:
+            str: збережений курсор або стартовий курсор відповідно до режиму холодного старту
+        """
+        if not self.cursor.is_empty:
+            return self.cursor.offset
 
-                logger.info(f"Отримано {len(tenders)} тендерів зі сторінки {pages}")
+        if self.cold_start == COLD_START_CATCHUP:
+            logger.info("Курсор відсутній: обхід стрічки з початку")
+            return ""
+
+        offset = await self._fetch_latest_offset()
+        logger.info(f"Курсор відсутній: старт з поточного моменту (offset={offset})")
+        self.cursor.update(offset)
+        return offset
+
+    def _pending_retries(self, page_items: Dict[str, str]) -> List[TenderRecord]:
+        """
+        Повертає тендери, які не вдалося дозавантажити в попередніх обходах.
 
-                for tender in tenders:
-                    tender_id = tender.get("id")
-                    if not tender_id or tender_id in self.seen_tenders:
-                        continue
+        Тендери, що знову з'явилися на поточній сторінці, пропускаються:
+        їх обробить сама сторінка.
 
-                    self.seen_tenders.add(tender_id)
+        Args:
+            page_items (dict): тендери поточної сторінки `{id: dateModified}`
 
-                    procuring_entity = tender.get("procuringEntity", {})
-                    address = procuring_entity.get("address", {}).get("region", "")
-                    cpv_code = tender.get("classification", {}).get("id", "")
+        Returns:
+            list: мінімальні записи, які потрібно дозавантажити
+        """
+        return [
+            TenderRecord(id=tender_id, date_modified=date_modified)
+            for tender_id, (date_modified, _) in self.cursor.retry.items()
+            if tender_id not in page_items
+        ]
+
+    def _defer_failed(
+        self, enriched: List[TenderRecord], failed: List[TenderRecord], missing: Iterable[TenderRecord] = ()
+    ) -> None:
+        """
+        Оновлює набір тендерів для повторного дозавантаження (зберігається разом з курсором).
 
-                    if not self._is_region_allowed(address):
-                        continue
-                    if not self._is_cpv_allowed(cpv_code):
-                        continue
+        Args:
+            enriched (list): успішно дозавантажені записи
+            failed (list): записи, які не вдалося дозавантажити
+            missing (iterable): записи тендерів, яких більше немає в API (не повторюються)
+        """
+        retry = self.cursor.retry
+        for record in itertools.chain(enriched, missing):
+            retry.pop(record.id, None)
+
+        for record in failed:
+            attempts = retry.get(record.id, [None, 0])[1] + 1
+            if attempts >= ENRICH_RETRY_SWEEPS:
+                logger.error(f"Тендер {record.id} не вдалося дозавантажити за {attempts} обходів, його пропущено")
+                retry.pop(record.id, None)
+            else:
+                retry[record.id] = [record.date_modified, attempts]
+
+        if failed:
+            logger.warning(f"{len(failed)} тендерів буде повторно дозавантажено в наступних обходах")
+
+    async def search_tenders(self) -> AsyncIterator[List[TenderMatch]]:
+        """
+        Пошук актуальних тендерів за фільтрами всіх підписок.
+
+        Асинхронний генератор: збіги кожної сторінки віддаються одразу, щойно
+        сторінку оброблено, тож перші сповіщення можна надсилати після першої
+        сторінки, а пам'ять не зростає з кількістю сторінок. Тендери сторінки
+        позначаються обробленими, а курсор пересувається лише після того, як
+        споживач забрав її збіги (наприклад, поставив у чергу надсилання).
+
+        За один виклик обробляється не більше MAX_PAGES сторінок. Кожен тендер
+        завантажується один раз незалежно від кількості підписок. Тендери, які
+        не вдалося дозавантажити, зберігаються разом з курсором і повторюються
+        на першій сторінці наступних обходів (до ENRICH_RETRY_SWEEPS разів).
+        Підсумок обходу зберігається в `last_sweep`.
+
+        Yields:
+            List[TenderMatch]: тендери сторінки разом з підписками, яким вони відповідають
+        """
+        pages = 0
+        stats = self.last_sweep = SweepStats()
+        sweep_started = time.perf_counter()
 
-                    tender_info = (
-                        f"📌 *{tender.get('title', 'Без назви')}*\n"
-                        f"🏢 Замовник: {procuring_entity.get('name', 'Невідомо')}\n"
-                        f"📍 Регіон: {address}\n"
-                        f"🆔 ID: {tender.get('tenderID')}\n"
-                        f"💰 Бюджет: {tender.get('value', {}).get('amount', 'Невідомо')} "
-                        f"{tender.get('value', {}).get('currency', '')}\n"
-                        f"🔗 [Деталі](https://prozorro.gov.ua/tender/{tender_id})"
-                    )
-                    results.append(tender_info)
+        try:
+            offset = await self._start_offset()
 
-                if not offset:  # Якщо більше немає сторінок
+            while pages < MAX_PAGES:
+                records, next_offset = await self._fetch_page(offset)
+                pages += 1
+                stats.pages = pages
+
+                logger.info(f"Отримано {len(records)} тендерів зі сторінки {pages}")
+                TENDERS.inc(len(records), stage="fetched")
+
+                # Пакетна перевірка всієї сторінки: нові або змінені з минулого разу
+                page_items = {record.id: record.date_modified for record in records}
+                with STAGE_SECONDS.time(stage="dedup"):
+                    new_ids = self.seen.filter_new(page_items)
+                stats.new_tenders += len(new_ids)
+                TENDERS.inc(len(new_ids), stage="new")
+
+                # Дозавантажуємо лише нові тендери, яким бракує полів для фільтрів
+                candidates = [record for record in records if record.id in new_ids]
+                if pages == 1:
+                    retries = self._pending_retries(page_items)
+                    candidates.extend(retries)
+                    page_items.update((record.id, record.date_modified) for record in retries)
+                with STAGE_SECONDS.time(stage="enrich"):
+                    candidates, failed, missing = await self.enricher.enrich(await self._get_session(), candidates)
+                self._defer_failed(candidates, failed, missing)
+                with STAGE_SECONDS.time(stage="mirror"):
+                    self.mirror.upsert(candidates)
+
+                with STAGE_SECONDS.time(stage="match"):
+                    matches = self.matcher.match_many(candidates)
+                page_results = [
+                    TenderMatch(record=record, subscriptions=matches[record.id])
+                    for record in candidates if record.id in matches
+                ]
+                if page_results:
+                    stats.matches += len(page_results)
+                    TENDERS.inc(len(page_results), stage="matched")
+                    yield page_results
+
+                with STAGE_SECONDS.time(stage="mark"):
+                    self.seen.mark({record.id: page_items[record.id] for record in itertools.chain(candidates, missing)})
+
+                if next_offset:
+                    watermark = max((to_utc(record.date_modified) for record in records if record.date_modified), default=None)
+                    self.cursor.update(next_offset, watermark)
+                else:
+                    self.cursor.save()
+
+                # Неповна сторінка означає, що ми дійшли до кінця стрічки
+                if not next_offset or len(records) < PAGE_LIMIT:
+                    stats.complete = True
                     break
 
-                time.sleep(REQUEST_DELAY)
+                offset = next_offset
+
+                await asyncio.sleep(self.request_delay)
 
-        except requests.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            stats.error = e
             logger.error(f"Помилка мережі при запиті до ProZorro API: {e}")
         except Exception as e:
+            stats.error = e
             logger.exception(f"Несподівана помилка при пошуку тендерів: {e}")
-
-        return results
+        finally:
+            SWEEP_SECONDS.observe(time.perf_counter() - sweep_started)
+            SWEEPS.inc(result="error" if stats.error else "complete" if stats.complete else "partial")
@@ -0,0 +1,8 @@
+"""Спільні налаштування тестів: config.py читає оточення під час імпорту."""
+
+import os
+import tempfile
+
+os.environ.setdefault("TELEGRAM_TOKEN", "test")
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="tender-bot-tests-"))
+os.environ.setdefault("METRICS_PORT", "0")
@@ -0,0 +1,19 @@
+import pytest
+
+from bot import parse_tenders_query
+
+
+def test_tenders_query_is_parsed():
+    query = parse_tenders_query(["ремонт", "min=100000,5", "region=Івано-Франківська_область", "cpv=45000000",
+                                 "days=7", "page=2"], chat_id=1)
+    assert query.keywords == ["ремонт"]
+    assert query.min_amount == 100000.5
+    assert query.regions == ["Івано-Франківська область"]
+    assert query.cpv_codes == ["45000000"]
+    assert (query.days, query.page) == (7, 2)
+
+
+@pytest.mark.parametrize("arg", ["page=0", "page=-1", "days=0", "page=abc", "min=багато"])
+def test_invalid_numbers_are_rejected(arg):
+    with pytest.raises(ValueError):
+        parse_tenders_query([arg], chat_id=1)
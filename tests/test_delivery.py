@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+from delivery import DIGEST_SEPARATOR, pack_digest
+from subscriptions import OutboxItem
+
+
+def item(index: int, length: int) -> OutboxItem:
+    return OutboxItem(str(index), "2026-01-01T00:00:00+00:00", str(index % 10) * length)
+
+
+def test_digest_packs_items_up_to_limit():
+    items = [item(i, 40) for i in range(10)]
+    digests = pack_digest(items, limit=100)
+
+    # 40 + 2 + 40 = 82 символи; третій тендер уже не вміщується
+    assert [len(batch) for _, batch in digests] == [2, 2, 2, 2, 2]
+    assert all(len(text) <= 100 for text, _ in digests)
+    assert [entry for _, batch in digests for entry in batch] == items
+
+
+def test_digest_text_joins_items_with_separator():
+    items = [item(1, 3), item(2, 3)]
+    [(text, batch)] = pack_digest(items, limit=100)
+    assert text == "111" + DIGEST_SEPARATOR + "222"
+    assert batch == items
+
+
+def test_exact_fit_stays_in_one_digest():
+    items = [item(1, 49), item(2, 49)]
+    assert len(pack_digest(items, limit=49 + len(DIGEST_SEPARATOR) + 49)) == 1
+    assert len(pack_digest(items, limit=49 + len(DIGEST_SEPARATOR) + 48)) == 2
+
+
+def test_oversized_item_is_truncated_to_limit():
+    digests = pack_digest([item(1, 10), item(2, 500), item(3, 10)], limit=100)
+    assert [len(text) for text, _ in digests] == [10, 100, 10]
+
+
+def test_empty_input():
+    assert pack_digest([], limit=100) == []
+
+
+class RejectingBot:
+    """Фіктивний бот: відхиляє Markdown-повідомлення з позначкою BAD."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        from telegram.error import BadRequest
+
+        if parse_mode and "BAD" in text:
+            raise BadRequest("Can't parse entities")
+        self.sent.append((parse_mode, text))
+
+
+def deliver_all(tmp_path, digest: bool):
+    from delivery import DeliveryQueue
+    from subscriptions import SubscriptionStore
+
+    async def run():
+        store = SubscriptionStore(str(tmp_path / "subscriptions.db"))
+        store.subscribe(1)
+        store.enqueue(1, [OutboxItem(str(i), "", "BAD" if i == 3 else f"tender {i}") for i in range(10)])
+
+        bot = RejectingBot()
+        queue = DeliveryQueue(bot, store, digest=digest, chat_rate=1000, global_rate=1000)
+        queue.start()
+        while store.outbox_size():
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        store.close()
+        return bot.sent
+
+    return asyncio.run(run())
+
+
+def test_rejected_digest_is_resent_item_by_item(tmp_path):
+    sent = deliver_all(tmp_path, digest=True)
+    assert (None, "BAD") in sent
+    assert sum(text.count("tender") for _, text in sent) == 9
+
+
+def test_rejected_message_falls_back_to_plain_text(tmp_path):
+    sent = deliver_all(tmp_path, digest=False)
+    assert len(sent) == 10
+    assert [text for mode, text in sent if mode is None] == ["BAD"]
+
+
+class ThrottledBot:
+    """Фіктивний бот: перше повідомлення в чат 1 отримує RetryAfter."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        from telegram.error import RetryAfter
+
+        if chat_id == 1 and self.retry_after:
+            retry_after, self.retry_after = self.retry_after, 0
+            raise RetryAfter(retry_after)
+        self.sent.append((chat_id, time.monotonic()))
+
+
+def test_retry_after_pauses_only_its_chat(tmp_path):
+    from delivery import DeliveryQueue
+    from subscriptions import SubscriptionStore
+
+    async def run():
+        store = SubscriptionStore(str(tmp_path / "subscriptions.db"))
+        for chat_id in (1, 2):
+            store.enqueue(chat_id, [OutboxItem("t1", "", "tender")])
+
+        bot = ThrottledBot(retry_after=1)
+        queue = DeliveryQueue(bot, store, chat_rate=1000, global_rate=1000)
+        started = time.monotonic()
+        queue.start()
+        while store.outbox_size():
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        store.close()
+        return {chat_id: sent_at - started for chat_id, sent_at in bot.sent}
+
+    sent = asyncio.run(run())
+    assert sent[2] < 0.5
+    assert sent[1] >= 1
+
+
+def test_retry_after_in_several_chats_pauses_all(tmp_path):
+    from delivery import GLOBAL_PAUSE_CHATS, DeliveryQueue
+    from subscriptions import SubscriptionStore
+
+    queue = DeliveryQueue(None, SubscriptionStore(str(tmp_path / "subscriptions.db")))
+    for chat_id in range(1, GLOBAL_PAUSE_CHATS):
+        queue._pause(chat_id, 10)
+    assert queue._global_paused_until == 0
+
+    queue._pause(GLOBAL_PAUSE_CHATS, 10)
+    assert queue._global_paused_until > time.monotonic() + 9
+
+
+def test_groups_use_group_rate(tmp_path):
+    from delivery import DeliveryQueue
+    from subscriptions import SubscriptionStore
+
+    queue = DeliveryQueue(None, SubscriptionStore(str(tmp_path / "subscriptions.db")), chat_rate=1, group_rate=0.25)
+
+    async def run():
+        await queue._throttle(42)
+        await queue._throttle(-100123)
+
+    asyncio.run(run())
+    assert queue._chat_buckets[42].rate == 1
+    assert queue._chat_buckets[-100123].rate == 0.25
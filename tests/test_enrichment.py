@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import enrichment
+from enrichment import TenderEnricher
+from records import TenderRecord
+
+
+def tender(tender_id: str) -> dict:
+    return {
+        "data": {
+            "id": tender_id,
+            "tenderID": f"UA-{tender_id}",
+            "title": f"Тендер {tender_id}",
+            "procuringEntity": {"name": "Замовник", "address": {"region": "Київ"}},
+            "classification": {"id": "45000000-7"},
+            "value": {"amount": 1000, "currency": "UAH"},
+            "dateModified": "2026-01-01T00:00:00+02:00",
+        }
+    }
+
+
+def make_app(requests: Counter, flaky_failures: int = 2, retry_after: str = "") -> web.Application:
+    """Стенд: `ok*` відповідають одразу, `flaky*` спершу 503, `down*` завжди 503, `gone*` 404, `broken*` — не JSON."""
+
+    async def handle(request: web.Request) -> web.Response:
+        tender_id = request.match_info["tender_id"]
+        requests[tender_id] += 1
+        if tender_id.startswith("gone"):
+            return web.Response(status=404)
+        if tender_id.startswith("broken"):
+            return web.Response(text='{"data": {"id"', content_type="application/json")
+        if tender_id.startswith("down") or (tender_id.startswith("flaky") and requests[tender_id] <= flaky_failures):
+            return web.Response(status=503, headers={"Retry-After": retry_after} if retry_after else None)
+        return web.json_response(tender(tender_id))
+
+    app = web.Application()
+    app.router.add_get("/{tender_id}", handle)
+    return app
+
+
+async def run_enrich(monkeypatch, app, ids, retries=3):
+    async with TestServer(app) as server:
+        monkeypatch.setattr(enrichment, "BASE_URL", str(server.make_url("")).rstrip("/"))
+        enricher = TenderEnricher(concurrency=4, rate_limit=1000, retries=retries, backoff=0.001)
+        async with aiohttp.ClientSession() as session:
+            return await enricher.enrich(session, [TenderRecord(id=tender_id) for tender_id in ids])
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    requests = Counter()
+    enriched, failed, missing = asyncio.run(
+        run_enrich(monkeypatch, make_app(requests), ["ok1", "flaky1", "flaky2"])
+    )
+
+    assert [record.id for record in enriched] == ["ok1", "flaky1", "flaky2"]
+    assert all(record.region == "Київ" and not record.needs_details for record in enriched)
+    assert failed == [] and missing == []
+    assert requests == {"ok1": 1, "flaky1": 3, "flaky2": 3}
+
+
+def test_exhausted_retries_and_bad_json_are_deferred(monkeypatch):
+    requests = Counter()
+    enriched, failed, missing = asyncio.run(
+        run_enrich(monkeypatch, make_app(requests), ["ok1", "down1", "broken1"], retries=2)
+    )
+
+    assert [record.id for record in enriched] == ["ok1"]
+    assert [record.id for record in failed] == ["down1", "broken1"]
+    assert missing == []
+    assert requests["down1"] == 3
+
+
+def test_missing_tenders_are_not_retried(monkeypatch):
+    requests = Counter()
+    enriched, failed, missing = asyncio.run(run_enrich(monkeypatch, make_app(requests), ["ok1", "gone1"]))
+
+    assert [record.id for record in enriched] == ["ok1"]
+    assert failed == []
+    assert [record.id for record in missing] == ["gone1"]
+    assert requests["gone1"] == 1
+
+
+def test_retry_after_header_is_honoured(monkeypatch):
+    requests = Counter()
+    started = time.monotonic()
+    enriched, _, _ = asyncio.run(
+        run_enrich(monkeypatch, make_app(requests, flaky_failures=1, retry_after="1"), ["flaky1"])
+    )
+
+    assert [record.id for record in enriched] == ["flaky1"]
+    assert time.monotonic() - started >= 1
+
+
+def test_complete_records_are_not_fetched(monkeypatch):
+    requests = Counter()
+    record = TenderRecord.from_api(tender("ok1")["data"])
+
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            return await TenderEnricher().enrich(session, [record])
+
+    assert asyncio.run(run()) == ([record], [], [])
+    assert not requests
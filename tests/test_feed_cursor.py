@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+
+from config import ENRICH_RETRY_SWEEPS
+from feed_cursor import COLD_START_CATCHUP, COLD_START_LATEST, FeedCursor
+from mirror import TenderMirror
+from records import TenderRecord
+from seen_store import MemorySeenStore
+from tender_api import ProZorroAPI
+
+
+def make_api(tmp_path, cold_start=COLD_START_LATEST) -> ProZorroAPI:
+    return ProZorroAPI(
+        cursor=FeedCursor(str(tmp_path / "cursor.json")),
+        cold_start=cold_start,
+        seen=MemorySeenStore(),
+        mirror=TenderMirror(":memory:"),
+    )
+
+
+def test_cursor_survives_restart(tmp_path):
+    path = str(tmp_path / "state" / "cursor.json")
+    cursor = FeedCursor(path)
+    assert cursor.is_empty
+
+    cursor.retry["t1"] = ["2026-01-01T00:00:00+00:00", 2]
+    cursor.update("1700000000.5", "2026-03-01T12:00:00+02:00")
+
+    restored = FeedCursor(path)
+    assert restored.offset == "1700000000.5"
+    assert restored.date_modified == "2026-03-01T10:00:00+00:00"
+    assert restored.retry == {"t1": ["2026-01-01T00:00:00+00:00", 2]}
+
+
+def test_save_replaces_file_atomically(tmp_path):
+    path = tmp_path / "cursor.json"
+    cursor = FeedCursor(str(path))
+    cursor.update("1")
+    cursor.update("2")
+
+    assert json.loads(path.read_text(encoding="utf-8"))["offset"] == "2"
+    assert not (tmp_path / "cursor.json.tmp").exists()
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "cursor.json"
+    path.write_text('{"offset": "12', encoding="utf-8")
+
+    cursor = FeedCursor(str(path))
+    assert cursor.is_empty
+    assert cursor.retry == {}
+
+
+def test_watermark_compares_dates_across_dst(tmp_path):
+    cursor = FeedCursor(str(tmp_path / "cursor.json"))
+    # 03:30 за літнім часом (00:30 UTC) раніше, ніж 03:10 після переходу на зимовий (01:10 UTC)
+    cursor.update("1", "2026-10-25T03:30:00+03:00")
+    cursor.update("2", "2026-10-25T03:10:00+02:00")
+    assert cursor.date_modified == "2026-10-25T01:10:00+00:00"
+
+    cursor.update("3", "2026-10-25T03:20:00+03:00")
+    assert cursor.date_modified == "2026-10-25T01:10:00+00:00"
+
+
+def test_unknown_cold_start_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        make_api(tmp_path, cold_start="newest")
+
+
+def test_cold_start_catchup_reads_feed_from_beginning(tmp_path):
+    api = make_api(tmp_path, cold_start=COLD_START_CATCHUP)
+    assert asyncio.run(api._start_offset()) == ""
+    assert api.cursor.is_empty
+
+
+def test_cold_start_latest_skips_history(tmp_path):
+    api = make_api(tmp_path, cold_start=COLD_START_LATEST)
+
+    async def latest_offset():
+        return "1700000000.1"
+
+    api._fetch_latest_offset = latest_offset
+    assert asyncio.run(api._start_offset()) == "1700000000.1"
+    assert FeedCursor(api.cursor.path).offset == "1700000000.1"
+
+
+def test_saved_cursor_takes_precedence_over_cold_start(tmp_path):
+    FeedCursor(str(tmp_path / "cursor.json")).update("42")
+    api = make_api(tmp_path, cold_start=COLD_START_CATCHUP)
+    assert asyncio.run(api._start_offset()) == "42"
+
+
+def test_failed_records_are_retried_until_limit(tmp_path):
+    api = make_api(tmp_path)
+    record = TenderRecord(id="t1", date_modified="2026-01-01T00:00:00+00:00")
+
+    api._defer_failed([], [record])
+    assert api.cursor.retry == {"t1": ["2026-01-01T00:00:00+00:00", 1]}
+
+    [pending] = api._pending_retries({})
+    assert (pending.id, pending.date_modified) == ("t1", "2026-01-01T00:00:00+00:00")
+    # Тендер, що знову є на сторінці, обробить сама сторінка
+    assert api._pending_retries({"t1": "2026-01-02T00:00:00+00:00"}) == []
+
+    for _ in range(ENRICH_RETRY_SWEEPS - 2):
+        api._defer_failed([], [record])
+    assert api.cursor.retry["t1"][1] == ENRICH_RETRY_SWEEPS - 1
+
+    api._defer_failed([], [record])
+    assert api.cursor.retry == {}
+
+
+def test_enriched_records_leave_retry_set(tmp_path):
+    api = make_api(tmp_path)
+    api._defer_failed([], [TenderRecord(id="t1"), TenderRecord(id="t2")])
+    api._defer_failed([TenderRecord(id="t1")], [])
+    assert list(api.cursor.retry) == ["t2"]
+
+
+def test_missing_records_leave_retry_set(tmp_path):
+    api = make_api(tmp_path)
+    api._defer_failed([], [TenderRecord(id="t1"), TenderRecord(id="t2")])
+    api._defer_failed([], [], [TenderRecord(id="t2")])
+    assert list(api.cursor.retry) == ["t1"]
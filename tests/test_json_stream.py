@@ -0,0 +1,106 @@
+import json
+import random
+
+import pytest
+
+from json_stream import ListingParser
+
+PAGE = {
+    "data": [
+        {"id": "a1", "title": "Закупівля \"молока\" \\ борошна", "value": {"amount": 12345.67}},
+        {"id": "b2", "title": "Emoji 😀 та і", "value": {"amount": -1.5e3}},
+        {"id": "c3", "title": "", "value": {"amount": 100}, "flags": [True, False, None]},
+    ],
+    "next_page": {"offset": "1727000000.123", "path": "/api/2.5/tenders?offset=1727000000.123"},
+    "prev_page": {"offset": "1726000000.5"},
+}
+
+
+def parse_in_chunks(body: str, sizes):
+    parser = ListingParser()
+    items, position = [], 0
+    for size in sizes:
+        items.extend(parser.feed(body[position:position + size]))
+        position += size
+    items.extend(parser.feed(body[position:], final=True))
+    return items, parser.meta
+
+
+def split_everywhere(body: str):
+    """Усі розбиття тіла на дві частини: межа потрапляє в кожен токен."""
+    for cut in range(len(body) + 1):
+        yield [cut]
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_every_two_chunk_split(ensure_ascii):
+    body = json.dumps(PAGE, ensure_ascii=ensure_ascii)
+    for sizes in split_everywhere(body):
+        items, meta = parse_in_chunks(body, sizes)
+        assert items == PAGE["data"], sizes
+        assert meta == {"next_page": PAGE["next_page"], "prev_page": PAGE["prev_page"]}
+
+
+def test_random_chunk_splits():
+    rng = random.Random(0)
+    body = json.dumps(PAGE, ensure_ascii=False, indent=2)
+    for _ in range(300):
+        sizes = [rng.randint(1, 12) for _ in range(len(body))]
+        items, meta = parse_in_chunks(body, sizes)
+        assert items == PAGE["data"]
+        assert meta["next_page"] == PAGE["next_page"]
+
+
+def test_number_cut_at_chunk_end_is_not_truncated():
+    parser = ListingParser()
+    assert parser.feed('{"data": [1, 23') == [1]
+    assert parser.feed("45, 6") == [2345]
+    assert parser.feed("]}", final=True) == [6]
+
+
+def test_escape_split_across_chunks():
+    parser = ListingParser()
+    assert parser.feed('{"data": ["a\\') == []
+    assert parser.feed('"b\\u04') == []
+    assert parser.feed('56"]}', final=True) == ['a"bі']
+
+
+def test_items_are_returned_as_soon_as_complete():
+    parser = ListingParser()
+    assert parser.feed('{"data": [{"id": "1"}, {"id"') == [{"id": "1"}]
+    assert parser.feed(': "2"}') == [{"id": "2"}]
+
+
+def test_empty_data_array():
+    items, meta = parse_in_chunks('{"data": [], "next_page": {"offset": "1"}}', [5, 5])
+    assert items == []
+    assert meta == {"next_page": {"offset": "1"}}
+
+
+def test_meta_before_data():
+    body = '{"next_page": {"offset": "7"}, "data": [{"id": "x"}]}'
+    items, meta = parse_in_chunks(body, [3] * 20)
+    assert items == [{"id": "x"}]
+    assert meta == {"next_page": {"offset": "7"}}
+
+
+@pytest.mark.parametrize("body", [
+    "",
+    '{"data": [{"id": "a"}',
+    '{"data": [{"id": "a"}]',
+    '{"data": [{"id": "a',
+    '{"data": [12',
+    '{"next_page": {"offset": "1"',
+    '{"data"',
+])
+def test_truncated_body_raises_on_final(body):
+    parser = ListingParser()
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed(body, final=True)
+
+
+@pytest.mark.parametrize("body", ['["data"]', '{"data" [1]}', '{"data": [tru]}'])
+def test_malformed_body_raises(body):
+    parser = ListingParser()
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed(body, final=True)
@@ -0,0 +1,70 @@
+from matcher import Subscription, SubscriptionMatcher, cpv_prefix, normalize_region
+from records import TenderRecord
+
+
+def tender(id: str, cpv: str, region: str) -> TenderRecord:
+    return TenderRecord(id=id, cpv=cpv, region=region)
+
+
+def test_cpv_prefix_follows_hierarchy_levels():
+    assert cpv_prefix("03000000-1") == "03"        # розділ
+    assert cpv_prefix("15400000-2") == "154"       # група
+    assert cpv_prefix("15420000-8") == "1542"      # клас
+    assert cpv_prefix("15421000-5") == "15421"     # категорія
+    assert cpv_prefix("15421100-6") == "154211"
+    assert cpv_prefix("15421110-9") == "1542111"
+    assert cpv_prefix("15421111-2") == "15421111"  # повний код
+    assert cpv_prefix("10000000") == "10"          # нулі розділу не відкидаються
+
+
+def test_cpv_group_matches_codes_inside_it_only():
+    matcher = SubscriptionMatcher([
+        Subscription("class", cpv_codes=["15420000"]),
+        Subscription("division", cpv_codes=["15000000-8"]),
+        Subscription("exact", cpv_codes=["15421000"]),
+    ])
+    assert matcher.match_cpv("15421000-5") == {"class", "division", "exact"}
+    assert matcher.match_cpv("15420000-8") == {"class", "division"}
+    assert matcher.match_cpv("15430000-1") == {"division"}
+    assert matcher.match_cpv("45000000-7") == set()
+
+
+def test_empty_filters_match_everything():
+    matcher = SubscriptionMatcher([Subscription("all")])
+    assert matcher.match(tender("a", "45000000-7", "Одеська область")) == {"all"}
+    assert matcher.match(tender("b", "", "")) == {"all"}
+
+
+def test_normalize_region():
+    assert normalize_region("  М. КИЇВ ") == "м київ"
+    assert normalize_region("Кам’янець-Подільський") == "кам'янець подільський"
+
+
+def test_region_matches_from_word_start():
+    matcher = SubscriptionMatcher([
+        Subscription("kyiv", regions=["Київ"]),
+        Subscription("city", regions=["м. Київ"]),
+    ])
+    assert matcher.match_region("Київська область") == {"kyiv"}
+    assert matcher.match_region("м. Київ") == {"kyiv", "city"}
+    assert matcher.match_region("Україна, м.Київ, вул. Хрещатик") == {"kyiv", "city"}
+    # Збіг лише з початком слова, а не з серединою
+    assert matcher.match_region("Микиїв") == set()
+    assert matcher.match_region("Черкаська область") == set()
+
+
+def test_match_requires_both_cpv_and_region():
+    matcher = SubscriptionMatcher([
+        Subscription("food-kyiv", cpv_codes=["15000000"], regions=["Київ"]),
+        Subscription("food-any", cpv_codes=["15000000"]),
+    ])
+    tenders = [
+        tender("1", "15420000-8", "Київська область"),
+        tender("2", "15420000-8", "Львівська область"),
+        tender("3", "45000000-7", "Київська область"),
+    ]
+    assert matcher.match_many(tenders) == {
+        "1": {"food-kyiv", "food-any"},
+        "2": {"food-any"},
+    }
+    assert matcher.match(tenders[0]) == {"food-kyiv", "food-any"}
@@ -0,0 +1,122 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from mirror import MirrorQuery, TenderMirror
+from records import TenderRecord
+
+
+def record(tender_id: str, date_modified: str = "2026-01-01T00:00:00+02:00", **fields) -> TenderRecord:
+    fields.setdefault("title", f"Тендер {tender_id}")
+    fields.setdefault("date_created", "2026-01-01T00:00:00+00:00")
+    return TenderRecord(id=tender_id, date_modified=date_modified, **fields)
+
+
+@pytest.fixture
+def mirror():
+    mirror = TenderMirror(":memory:")
+    yield mirror
+    mirror.close()
+
+
+def titles(mirror: TenderMirror, **query) -> list:
+    records, _ = mirror.search(MirrorQuery(page_size=100, **query))
+    return sorted(record.title for record in records)
+
+
+def test_upsert_keeps_newest_revision_across_dst(mirror):
+    # 03:10 після переходу на зимовий час (01:10 UTC) пізніше, ніж 03:30 літнього (00:30 UTC)
+    mirror.upsert([record("t1", "2026-10-25T03:30:00+03:00", title="Стара редакція")])
+    mirror.upsert([record("t1", "2026-10-25T03:10:00+02:00", title="Нова редакція")])
+    assert titles(mirror) == ["Нова редакція"]
+
+    mirror.upsert([record("t1", "2026-10-25T03:50:00+03:00", title="Застаріла редакція")])
+    [stored], total = mirror.search(MirrorQuery())
+    assert total == 1
+    assert stored.title == "Нова редакція"
+    assert stored.date_modified == "2026-10-25T01:10:00+00:00"
+
+
+def test_keywords_match_word_prefixes(mirror):
+    mirror.upsert([
+        record("t1", title="Ремонт даху школи"),
+        record("t2", title="Поточний ремонт доріг"),
+        record("t3", title="Закупівля молока"),
+    ])
+    assert titles(mirror, keywords=["ремонт"]) == ["Поточний ремонт доріг", "Ремонт даху школи"]
+    assert titles(mirror, keywords=["рем", "дор"]) == ["Поточний ремонт доріг"]
+    assert titles(mirror, keywords=['"молок']) == ["Закупівля молока"]
+    assert titles(mirror, keywords=["хліб"]) == []
+
+
+def test_title_change_updates_search_index(mirror):
+    mirror.upsert([record("t1", "2026-01-01T00:00:00+02:00", title="Закупівля хліба")])
+    mirror.upsert([record("t1", "2026-01-02T00:00:00+02:00", title="Закупівля молока")])
+    assert titles(mirror, keywords=["хліб"]) == []
+    assert titles(mirror, keywords=["молоко"]) == []
+    assert titles(mirror, keywords=["молок"]) == ["Закупівля молока"]
+
+
+def test_filters_by_amount_region_and_cpv(mirror):
+    mirror.upsert([
+        record("t1", amount=50_000, region="м. Київ", cpv="15420000-8"),
+        record("t2", amount=150_000, region="Київська область", cpv="15330000-0"),
+        record("t3", amount=500_000, region="Львівська область", cpv="45230000-8"),
+        record("t4", amount=None, region=None, cpv=None),
+    ])
+    assert titles(mirror, min_amount=100_000) == ["Тендер t2", "Тендер t3"]
+    assert titles(mirror, regions=["київ"]) == ["Тендер t1", "Тендер t2"]
+    assert titles(mirror, regions=["Львівська", "м. Київ"]) == ["Тендер t1", "Тендер t3"]
+    assert titles(mirror, cpv_codes=["15000000"]) == ["Тендер t1", "Тендер t2"]
+    assert titles(mirror, cpv_codes=["15420000", "45000000"]) == ["Тендер t1", "Тендер t3"]
+    assert titles(mirror, min_amount=100_000, regions=["київ"], cpv_codes=["15000000"]) == ["Тендер t2"]
+
+
+def test_filters_by_creation_date(mirror):
+    now = datetime.now(timezone.utc)
+    mirror.upsert([
+        record("t1", date_created=(now - timedelta(days=1)).isoformat()),
+        record("t2", date_created=(now - timedelta(days=10)).isoformat()),
+    ])
+    assert titles(mirror, days=7) == ["Тендер t1"]
+    assert titles(mirror, days=30) == ["Тендер t1", "Тендер t2"]
+
+
+def test_results_are_paginated_newest_first(mirror):
+    mirror.upsert([
+        record(f"t{day}", date_created=f"2026-01-{day:02d}T00:00:00+00:00") for day in range(1, 13)
+    ])
+
+    pages = []
+    for page in range(1, 5):
+        records, total = mirror.search(MirrorQuery(page=page, page_size=5))
+        assert total == 12
+        pages.append([record.id for record in records])
+
+    assert pages == [
+        ["t12", "t11", "t10", "t9", "t8"],
+        ["t7", "t6", "t5", "t4", "t3"],
+        ["t2", "t1"],
+        [],
+    ]
+    # Некоректний номер сторінки вважається першою сторінкою
+    assert mirror.search(MirrorQuery(page=0, page_size=5))[0][0].id == "t12"
+
+
+def test_missing_creation_dates_are_backfilled(tmp_path):
+    path = str(tmp_path / "mirror.db")
+    mirror = TenderMirror(path)
+    mirror.upsert([record("t1", "2026-03-01T12:00:00+02:00", date_created=None)])
+    mirror.close()
+
+    # База, збережена до появи дати створення
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE tenders SET date_created = NULL, date_modified = '2026-03-01T12:00:00+02:00'")
+    conn.close()
+
+    mirror = TenderMirror(path)
+    [stored], _ = mirror.search(MirrorQuery())
+    assert stored.date_created == "2026-03-01T10:00:00+00:00"
+    mirror.close()
@@ -0,0 +1,38 @@
+import time
+import asyncio
+
+from ratelimit import TokenBucket, HostRateLimiter
+
+
+def elapsed(coroutine) -> float:
+    started = time.monotonic()
+    asyncio.run(coroutine)
+    return time.monotonic() - started
+
+
+def test_burst_up_to_capacity_is_immediate():
+    async def run():
+        bucket = TokenBucket(rate=10, capacity=5)
+        for _ in range(5):
+            await bucket.acquire()
+
+    assert elapsed(run()) < 0.05
+
+
+def test_acquire_waits_for_refill():
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=1)
+        for _ in range(6):
+            await bucket.acquire()
+
+    # Перший токен є одразу, ще п'ять поповнюються по 20 мс
+    assert 0.09 <= elapsed(run()) < 0.5
+
+
+def test_host_limiter_keeps_separate_buckets():
+    async def run():
+        limiter = HostRateLimiter(rate=1, capacity=1)
+        await limiter.acquire("https://a.example/tenders/1")
+        await limiter.acquire("https://b.example/tenders/1")
+
+    assert elapsed(run()) < 0.05
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+import pytz
+
+import scheduler
+from config import (
+    ACTIVITY_SCALE, ERROR_BACKOFF_MAX, POLL_INTERVAL_BUSY, POLL_INTERVAL_IDLE, POLL_INTERVAL_MAX, POLL_INTERVAL_MIN
+)
+from scheduler import AdaptiveScheduler
+from tender_api import RateLimitedError, SweepStats
+
+# Понеділок, 13:00 за Києвом
+WORKDAY_NOON = datetime(2026, 10, 19, 10, 0, tzinfo=pytz.utc)
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: 1.0)
+
+
+def test_business_hours_use_busy_interval():
+    planner = AdaptiveScheduler()
+    assert planner.base_interval(WORKDAY_NOON) == POLL_INTERVAL_BUSY
+    # 06:00 за Києвом у понеділок та полудень неділі
+    assert planner.base_interval(datetime(2026, 10, 19, 3, 0, tzinfo=pytz.utc)) == POLL_INTERVAL_IDLE
+    assert planner.base_interval(datetime(2026, 10, 18, 10, 0, tzinfo=pytz.utc)) == POLL_INTERVAL_IDLE
+
+
+def test_errors_back_off_exponentially_up_to_limit():
+    planner = AdaptiveScheduler()
+    failure = SweepStats(error=ConnectionError("down"))
+
+    delays = [planner.next_delay(failure, WORKDAY_NOON) for _ in range(10)]
+    assert delays[:3] == [POLL_INTERVAL_MIN * 2, POLL_INTERVAL_MIN * 4, POLL_INTERVAL_MIN * 8]
+    assert max(delays) == delays[-1] == ERROR_BACKOFF_MAX
+    assert planner.failures == 10
+
+    planner.next_delay(SweepStats(complete=True), WORKDAY_NOON)
+    assert planner.failures == 0
+
+
+def test_retry_after_sets_minimum_delay():
+    planner = AdaptiveScheduler()
+    assert planner.next_delay(SweepStats(error=RateLimitedError(retry_after=900)), WORKDAY_NOON) == 900
+    # Retry-After коротший за паузу після помилок не скорочує її
+    assert planner.next_delay(SweepStats(error=RateLimitedError(retry_after=1)), WORKDAY_NOON) == POLL_INTERVAL_MIN * 4
+
+
+def test_activity_shortens_interval():
+    planner = AdaptiveScheduler()
+    quiet = planner.next_delay(SweepStats(complete=True), WORKDAY_NOON)
+    assert quiet == POLL_INTERVAL_BUSY
+
+    delays = [planner.next_delay(SweepStats(complete=True, new_tenders=ACTIVITY_SCALE), WORKDAY_NOON) for _ in range(3)]
+    assert delays == sorted(delays, reverse=True)
+    assert POLL_INTERVAL_BUSY / 2 < delays[-1] < POLL_INTERVAL_BUSY
+
+    # Згладжена активність спадає поступово
+    calmer = planner.next_delay(SweepStats(complete=True), WORKDAY_NOON)
+    assert delays[-1] < calmer < POLL_INTERVAL_BUSY
+
+
+def test_interval_is_clamped():
+    planner = AdaptiveScheduler()
+    assert planner.next_delay(SweepStats(complete=True, new_tenders=100_000), WORKDAY_NOON) == POLL_INTERVAL_MIN
+    assert planner.next_delay(SweepStats(complete=True), WORKDAY_NOON) <= POLL_INTERVAL_MAX
+
+
+def test_incomplete_sweep_continues_after_minimum_interval():
+    planner = AdaptiveScheduler()
+    assert planner.next_delay(SweepStats(complete=False, new_tenders=0), WORKDAY_NOON) == POLL_INTERVAL_MIN
@@ -0,0 +1,114 @@
+import pytest
+
+import seen_store
+from seen_store import SQLITE_BATCH_SIZE, MemorySeenStore, SQLiteSeenStore, create_seen_store
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(seen_store.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    store = MemorySeenStore() if request.param == "memory" else SQLiteSeenStore(str(tmp_path / "seen.db"))
+    yield store
+    store.close()
+
+
+def test_new_and_changed_tenders_are_reported(store):
+    items = {"a": "2026-01-01T00:00:00+00:00", "b": "2026-01-01T00:00:00+00:00"}
+    assert store.filter_new(items) == {"a", "b"}
+
+    store.mark(items)
+    assert store.filter_new(items) == set()
+    assert len(store) == 2
+
+    # Тендер "a" змінився: його dateModified інший
+    changed = {"a": "2026-01-02T00:00:00+00:00", "b": "2026-01-01T00:00:00+00:00", "c": "2026-01-02T00:00:00+00:00"}
+    assert store.filter_new(changed) == {"a", "c"}
+
+    store.mark(changed)
+    assert store.filter_new(changed) == set()
+    assert len(store) == 3
+
+
+def test_memory_store_evicts_oldest_over_max_size():
+    store = MemorySeenStore(max_size=3, ttl=None)
+    store.mark({"a": "1", "b": "1", "c": "1"})
+    # Повторна позначка оновлює позицію "a" у черзі витіснення
+    store.mark({"a": "1"})
+    store.mark({"d": "1"})
+
+    assert len(store) == 3
+    assert store.filter_new({"a": "1", "b": "1", "c": "1", "d": "1"}) == {"b"}
+
+
+def test_memory_store_evicts_expired_entries(clock):
+    store = MemorySeenStore(max_size=100, ttl=60)
+    store.mark({"a": "1"})
+    clock.now += 30
+    store.mark({"b": "1"})
+    clock.now += 40
+    store.mark({"c": "1"})
+
+    assert len(store) == 2
+    assert store.filter_new({"a": "1", "b": "1", "c": "1"}) == {"a"}
+
+
+def test_sqlite_store_queries_large_pages_in_batches(tmp_path):
+    store = SQLiteSeenStore(str(tmp_path / "seen.db"))
+    total = SQLITE_BATCH_SIZE * 2 + 10
+    items = {f"t{i}": "1" for i in range(total)}
+    store.mark({tender_id: "1" for tender_id in list(items)[::2]})
+
+    queries = []
+    store._conn.set_trace_callback(queries.append)
+    new_ids = store.filter_new(items)
+    store._conn.set_trace_callback(None)
+
+    assert new_ids == {f"t{i}" for i in range(1, total, 2)}
+    assert len([query for query in queries if query.startswith("SELECT")]) == 3
+    store.close()
+
+
+def test_sqlite_store_prunes_expired_entries(tmp_path, clock):
+    store = SQLiteSeenStore(str(tmp_path / "seen.db"), ttl=SQLiteSeenStore.PRUNE_INTERVAL)
+    store.mark({"a": "1"})
+    clock.now += SQLiteSeenStore.PRUNE_INTERVAL / 2
+    store.mark({"b": "1"})
+    # Чистка ще не настала: минуло менше за PRUNE_INTERVAL
+    assert len(store) == 2
+
+    # Чистка видаляє лише записи, старші за ttl: "b" ще живий
+    clock.now += SQLiteSeenStore.PRUNE_INTERVAL * 0.75
+    store.mark({"c": "1"})
+    assert store.filter_new({"a": "1", "b": "1", "c": "1"}) == {"a"}
+    store.close()
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = str(tmp_path / "seen.db")
+    store = SQLiteSeenStore(path)
+    store.mark({"a": "1"})
+    store.close()
+
+    store = SQLiteSeenStore(path)
+    assert store.filter_new({"a": "1", "b": "1"}) == {"b"}
+    store.close()
+
+
+def test_create_seen_store_rejects_unknown_backend():
+    assert isinstance(create_seen_store("memory"), MemorySeenStore)
+    with pytest.raises(ValueError):
+        create_seen_store("redis")
@@ -0,0 +1,80 @@
+import pytest
+
+from subscriptions import OutboxItem, SubscriptionStore
+
+CHAT = 100
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "subscriptions.db")
+
+
+def item(tender_id: str, date_modified: str = "2026-01-01T00:00:00+00:00") -> OutboxItem:
+    return OutboxItem(tender_id, date_modified, f"Тендер {tender_id}")
+
+
+def test_bootstrap_subscribes_initial_chat_once(db_path):
+    store = SubscriptionStore(db_path)
+    assert store.bootstrap(CHAT)
+    assert [subscription.id for subscription in store.all()] == [str(CHAT)]
+    assert not store.bootstrap(CHAT)
+
+
+def test_bootstrap_does_not_resubscribe_after_unsubscribe(db_path):
+    store = SubscriptionStore(db_path)
+    store.bootstrap(CHAT)
+    assert store.unsubscribe(CHAT)
+    store.close()
+
+    # Перезапуск з тим самим CHAT_ID у .env
+    store = SubscriptionStore(db_path)
+    assert not store.bootstrap(CHAT)
+    assert store.get(CHAT) is None
+    store.close()
+
+
+def test_bootstrap_skips_database_with_data(db_path):
+    store = SubscriptionStore(db_path)
+    store.subscribe(200)
+    assert not store.bootstrap(CHAT)
+    assert store.get(CHAT) is None
+
+    other = SubscriptionStore(db_path.replace("subscriptions", "deliveries"))
+    other.mark_delivered(200, {"t1": "1"})
+    assert not other.bootstrap(CHAT)
+    assert other.get(CHAT) is None
+
+
+def test_enqueue_skips_delivered_tenders(db_path):
+    store = SubscriptionStore(db_path)
+    store.subscribe(CHAT)
+    assert store.enqueue(CHAT, [item("t1"), item("t2")]) == 2
+
+    store.complete(CHAT, store.pending(CHAT, limit=10))
+    assert store.outbox_size() == 0
+
+    # Та сама редакція вже надіслана, нова редакція стає в чергу знову
+    assert store.enqueue(CHAT, [item("t1"), item("t2", "2026-01-02T00:00:00+00:00")]) == 1
+    assert store.pending(CHAT, limit=10) == [item("t2", "2026-01-02T00:00:00+00:00")]
+
+
+def test_enqueue_replaces_queued_tender_with_newer_revision(db_path):
+    store = SubscriptionStore(db_path)
+    store.enqueue(CHAT, [item("t1")])
+    store.enqueue(CHAT, [item("t1", "2026-01-02T00:00:00+00:00")])
+    assert store.pending(CHAT, limit=10) == [item("t1", "2026-01-02T00:00:00+00:00")]
+
+
+def test_unsubscribe_clears_outbox_and_deliveries(db_path):
+    store = SubscriptionStore(db_path)
+    store.subscribe(CHAT)
+    store.subscribe(200)
+    store.enqueue(CHAT, [item("t1"), item("t2")])
+    store.enqueue(200, [item("t1")])
+    store.complete(CHAT, [item("t1")])
+
+    assert store.unsubscribe(CHAT)
+    assert store.pending_chats() == [200]
+    assert store.filter_undelivered(CHAT, {"t1": item("t1").date_modified}) == {"t1"}
+    assert not store.unsubscribe(CHAT)
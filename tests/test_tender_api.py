@@ -0,0 +1,100 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import tender_api
+from feed_cursor import COLD_START_CATCHUP, FeedCursor
+from metrics import PAGES
+from mirror import TenderMirror
+from seen_store import MemorySeenStore
+from tender_api import ProZorroAPI
+
+LISTING = {
+    "data": [
+        {
+            "id": "t1",
+            "tenderID": "UA-2026-01-01-000001-a",
+            "title": "Закупівля хліба",
+            "procuringEntity": {"name": "Школа", "address": {"region": "Київ"}},
+            "classification": {"id": "15810000-9"},
+            "value": {"amount": 1000, "currency": "UAH"},
+            "dateModified": "2026-01-01T10:00:00+02:00",
+        }
+    ],
+    "next_page": {"offset": "1767254400.0"},
+}
+
+
+def make_app(conditions: list) -> web.Application:
+    """Стенд стрічки з ETag: повторний запит з If-None-Match отримує 304."""
+
+    async def listing(request: web.Request) -> web.Response:
+        conditions.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.json_response(LISTING, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/tenders", listing)
+    return app
+
+
+def test_unchanged_page_is_not_downloaded_again(tmp_path, monkeypatch):
+    conditions = []
+
+    async def run():
+        async with TestServer(make_app(conditions)) as server:
+            monkeypatch.setattr(tender_api, "BASE_URL", str(server.make_url("/tenders")))
+            api = ProZorroAPI(
+                cursor=FeedCursor(str(tmp_path / "cursor.json")),
+                cold_start=COLD_START_CATCHUP,
+                seen=MemorySeenStore(),
+                mirror=TenderMirror(":memory:"),
+                request_delay=0,
+            )
+            try:
+                first = await api._fetch_page("")
+                not_modified = PAGES.get(result="not_modified")
+                second = await api._fetch_page("")
+                return first, second, PAGES.get(result="not_modified") - not_modified
+            finally:
+                await api.close()
+
+    (records, next_offset), second, not_modified = asyncio.run(run())
+
+    assert [record.id for record in records] == ["t1"]
+    assert next_offset == "1767254400.0"
+    assert conditions == [None, '"v1"']
+    assert second == ([], "")
+    assert not_modified == 1
+
+
+def test_sweep_over_unchanged_feed_finds_nothing(tmp_path, monkeypatch):
+    async def run():
+        async with TestServer(make_app([])) as server:
+            monkeypatch.setattr(tender_api, "BASE_URL", str(server.make_url("/tenders")))
+            api = ProZorroAPI(
+                cursor=FeedCursor(str(tmp_path / "cursor.json")),
+                cold_start=COLD_START_CATCHUP,
+                seen=MemorySeenStore(),
+                mirror=TenderMirror(":memory:"),
+                request_delay=0,
+            )
+            # Кінець стрічки: курсор наступної сторінки збігається з поточним,
+            # тож другий обхід запитує ту саму сторінку умовно
+            api.cursor.update(LISTING["next_page"]["offset"])
+            try:
+                sweeps = []
+                for _ in range(2):
+                    not_modified = PAGES.get(result="not_modified")
+                    matches = [match async for page in api.search_tenders() for match in page]
+                    sweeps.append((len(matches), api.last_sweep, PAGES.get(result="not_modified") - not_modified))
+                return sweeps
+            finally:
+                await api.close()
+
+    (matches, first, not_modified), (_, second, second_not_modified) = asyncio.run(run())
+    assert (matches, first.new_tenders, first.complete, not_modified) == (1, 1, True, 0)
+    assert second_not_modified == 1
+    assert second.complete and second.error is None and second.new_tenders == 0